@@ -4,21 +4,45 @@ from __future__ import annotations
 
 from pathlib import Path
 import asyncio
-from dataclasses import dataclass
+from bisect import bisect_right
+from contextlib import AbstractContextManager, nullcontext
+from datetime import timedelta
+from http import HTTPStatus
 import logging
+from operator import attrgetter
+import secrets
+import time
 from typing import Any
 
+from aiohttp import web
+
 from homeassistant.components import panel_custom
 from homeassistant.components.http import HomeAssistantView, StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_STATE_CHANGED, Platform
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers import area_registry as ar
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.typing import ConfigType
-
-from .api import HAAgentApi
+from homeassistant.util import dt as dt_util
+
+from .addon_config import (
+    AddonConfig,
+    AddonConfigConflict,
+    async_get_addon_config,
+    async_update_addon_config,
+    routed_base_url,
+)
+from .api import HAAgentApi, normalize_base_url
+from .journal_index import JournalIndex
+from .loop_monitor import LoopLagMonitor
+from .memory_index import MemoryIndex, numpy_available
+from .entities import ENTITY_FIELDS, EntityRecord, entity_dict
 from .conversation import (
     HAAgentConversationAgent,
     async_register_agent,
@@ -26,48 +50,70 @@ from .conversation import (
     async_unregister_agent,
 )
 from .const import (
+    BACKEND_PROBE_INTERVAL,
     CONF_BASE_URL,
+    CONF_JOURNAL_MIRROR,
+    CONF_MEMORY_MIRROR,
     CONF_SET_DEFAULT_AGENT,
     DEFAULT_BASE_URL,
     DEFAULT_INSTRUCTION,
     DOMAIN,
+    HEALTH_CHECK_TIMEOUT,
+    JOURNAL_SYNC_INTERVAL,
+    MEMORY_SYNC_INTERVAL,
     PANEL_COMPONENT_NAME,
     PANEL_FRONTEND_URL,
     PANEL_ICON,
     PANEL_MODULE_URL,
     PANEL_TITLE,
 )
+from .services import async_setup_services
+from .stats import cache_stats
 from .storage import HAAgentStorage
+from .suggestions import HAAgentSuggestionCache
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
 PANEL_FILE_PATH = Path(__file__).parent / "panel" / "home-assistant-agent-panel.js"
 PANEL_STATIC_URL = "/home_assistant_agent_panel/home-assistant-agent-panel.js"
 
+PLATFORMS = [Platform.STT, Platform.TTS]
+
+ENTITY_PAYLOAD_CHUNK = 500
+# State attributes the entity payload falls back to.
+PAYLOAD_STATE_ATTRIBUTES = ("friendly_name", "device_class", "unit_of_measurement")
+
+
+def _default_domain_data(hass: HomeAssistant) -> dict[str, Any]:
+    return {
+        "entries": {},
+        "panel_registered": False,
+        "views_registered": False,
+        "registry_listeners": [],
+        # The token keeps ETags from matching across restarts, when the
+        # version counter starts over.
+        "registry_token": secrets.token_hex(4),
+        "registry_version": 0,
+        "entity_payload": None,
+        "entity_payload_build": None,
+        "loop_monitor": LoopLagMonitor(hass.loop),
+        "journal_index": None,
+        "entity_payload_timing": None,
+        "cache_stats": {},
+        "storage": HAAgentStorage(hass),
+        "suggestions": HAAgentSuggestionCache(hass),
+    }
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
-    hass.data.setdefault(
-        DOMAIN,
-        {
-            "entries": {},
-            "panel_registered": False,
-            "views_registered": False,
-            "storage": HAAgentStorage(hass),
-        },
-    )
+    hass.data.setdefault(DOMAIN, _default_domain_data(hass))
+    async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    domain_data = hass.data.setdefault(
-        DOMAIN,
-        {
-            "entries": {},
-            "panel_registered": False,
-            "views_registered": False,
-            "storage": HAAgentStorage(hass),
-        },
-    )
+    domain_data = hass.data.setdefault(DOMAIN, _default_domain_data(hass))
 
     session = aiohttp_client.async_get_clientsession(hass)
     storage: HAAgentStorage = domain_data["storage"]
@@ -78,7 +124,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             seed["base_url"] = base_url
         await storage.async_set_entry(entry.entry_id, seed)
     settings = await storage.async_get_entry(entry.entry_id)
-    client = HAAgentApi(settings.get("base_url", DEFAULT_BASE_URL), session)
+    loop_monitor: LoopLagMonitor = domain_data["loop_monitor"]
+    loop_monitor.start()
+    client = HAAgentApi(
+        _stored_base_urls(settings),
+        session,
+        loop_monitor=loop_monitor,
+    )
     agent = HAAgentConversationAgent(hass, entry.entry_id)
     domain_data["entries"][entry.entry_id] = {
         "client": client,
@@ -89,7 +141,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "addon_config_ts": 0.0,
     }
     entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
+
+    async def _async_probe_backends(_now) -> None:
+        await client.async_probe_backends()
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _async_probe_backends, timedelta(seconds=BACKEND_PROBE_INTERVAL)
+        )
+    )
+    _async_update_journal_mirror(hass, entry)
+    _async_update_memory_mirror(hass, entry)
     await async_register_agent(hass, entry, agent)
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     if entry.options.get(CONF_SET_DEFAULT_AGENT):
         await async_set_default_agent(hass, agent)
@@ -98,18 +162,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await _async_register_panel(hass)
         domain_data["panel_registered"] = True
 
+    if not domain_data["registry_listeners"]:
+        domain_data["registry_listeners"] = _async_track_registry_version(hass)
+
     if not domain_data["views_registered"]:
         _register_views(hass)
+        async_register_websocket_commands(hass)
         domain_data["views_registered"] = True
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
     domain_data = hass.data.get(DOMAIN, {})
     entry_data = domain_data.get("entries", {}).pop(entry.entry_id, None)
     if entry_data and entry_data.get("agent"):
         await async_unregister_agent(hass, entry, entry_data["agent"])
+    if entry_data and entry_data.get("journal_mirror_unsub"):
+        entry_data["journal_mirror_unsub"]()
+        await _async_release_journal_index(hass)
+    if entry_data and entry_data.get("memory_mirror_unsub"):
+        entry_data["memory_mirror_unsub"]()
+
+    if not domain_data.get("entries"):
+        # Suggestions, the loop monitor and the registry listeners are shared
+        # by all entries; only tear them down with the last one.
+        for unsub in domain_data.get("registry_listeners") or []:
+            unsub()
+        domain_data["registry_listeners"] = []
+        # Nothing tracks the registries now, so a cached payload may go stale.
+        domain_data["entity_payload"] = None
+        if domain_data.get("suggestions"):
+            domain_data["suggestions"].async_cancel()
+        if domain_data.get("loop_monitor"):
+            domain_data["loop_monitor"].stop()
 
     if not hass.config_entries.async_entries(DOMAIN):
         if domain_data.get("panel_registered"):
@@ -127,11 +215,95 @@ async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
     if storage:
         settings = await storage.async_get_entry(entry.entry_id)
         entry_data["settings"] = settings
-        entry_data["client"].set_base_url(settings.get("base_url", DEFAULT_BASE_URL))
+        entry_data["client"].set_base_urls(_stored_base_urls(settings))
+    _async_update_journal_mirror(hass, entry)
+    _async_update_memory_mirror(hass, entry)
     if entry.options.get(CONF_SET_DEFAULT_AGENT):
         await async_set_default_agent(hass, entry_data["agent"])
 
 
+@callback
+def _async_update_journal_mirror(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Start or stop the periodic journal mirror sync to match the options."""
+    domain_data = hass.data[DOMAIN]
+    entry_data = domain_data["entries"][entry.entry_id]
+    enabled = entry.options.get(CONF_JOURNAL_MIRROR, False)
+    unsub = entry_data.get("journal_mirror_unsub")
+    if not enabled:
+        if unsub:
+            unsub()
+            entry_data["journal_mirror_unsub"] = None
+            hass.async_create_task(
+                _async_release_journal_index(hass),
+                "home_assistant_agent journal index close",
+            )
+        return
+    if unsub:
+        return
+
+    index: JournalIndex | None = domain_data.get("journal_index")
+    if index is None:
+        index = domain_data["journal_index"] = JournalIndex(hass)
+    client: HAAgentApi = entry_data["client"]
+
+    async def _async_sync(_now=None) -> None:
+        await index.async_sync(client)
+
+    entry_data["journal_mirror_unsub"] = async_track_time_interval(
+        hass, _async_sync, timedelta(seconds=JOURNAL_SYNC_INTERVAL)
+    )
+    hass.async_create_background_task(
+        _async_sync(), "home_assistant_agent journal mirror sync"
+    )
+
+
+async def _async_release_journal_index(hass: HomeAssistant) -> None:
+    """Close the shared journal index once no entry mirrors journals."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if any(
+        entry_data.get("journal_mirror_unsub")
+        for entry_data in domain_data.get("entries", {}).values()
+    ):
+        return
+    index: JournalIndex | None = domain_data.get("journal_index")
+    if index is not None:
+        domain_data["journal_index"] = None
+        await index.async_close()
+
+
+@callback
+def _async_update_memory_mirror(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Attach or detach the local memory index to match the options."""
+    entry_data = hass.data[DOMAIN]["entries"][entry.entry_id]
+    client: HAAgentApi = entry_data["client"]
+    enabled = entry.options.get(CONF_MEMORY_MIRROR, False)
+    unsub = entry_data.get("memory_mirror_unsub")
+    if not enabled:
+        if unsub:
+            unsub()
+            entry_data["memory_mirror_unsub"] = None
+        client.set_memory_index(None)
+        return
+    if unsub:
+        return
+    if not numpy_available():
+        _LOGGER.warning(
+            "The memory mirror needs numpy, which is not installed; "
+            "memory queries will stay remote"
+        )
+        return
+
+    index = MemoryIndex()
+    client.set_memory_index(index)
+
+    async def _async_sync(_now=None) -> None:
+        await index.async_sync(client)
+
+    entry_data["memory_mirror_unsub"] = async_track_time_interval(
+        hass, _async_sync, timedelta(seconds=MEMORY_SYNC_INTERVAL)
+    )
+
+
 async def _async_register_panel(hass: HomeAssistant) -> None:
     await hass.http.async_register_static_paths(
         [StaticPathConfig(PANEL_STATIC_URL, str(PANEL_FILE_PATH), False)]
@@ -180,6 +352,17 @@ def _get_entry_and_client(
     return entry, entry_data["client"]
 
 
+def _stored_base_urls(settings: dict[str, Any]) -> list[str]:
+    """Return the stored base URLs that are valid, or the default."""
+    base_urls = []
+    for url in settings.get("base_urls") or []:
+        try:
+            base_urls.append(normalize_base_url(url))
+        except ValueError:
+            _LOGGER.warning("Ignoring invalid stored base URL %r", url)
+    return base_urls or [DEFAULT_BASE_URL]
+
+
 async def _update_settings(
     hass: HomeAssistant, entry: ConfigEntry, updates: dict[str, Any]
 ) -> dict[str, Any]:
@@ -188,127 +371,231 @@ async def _update_settings(
     if not storage:
         return {}
     filtered = {}
-    if "base_url" in updates:
-        filtered["base_url"] = updates.get("base_url")
+    if "base_urls" in updates:
+        # Raises ValueError before anything is stored; a stored invalid URL
+        # would fail setup on the next restart.
+        base_urls = [
+            normalize_base_url(url) for url in updates.get("base_urls") or [] if url
+        ]
+        if base_urls:
+            filtered["base_urls"] = base_urls
+            filtered["base_url"] = base_urls[0]
+    elif "base_url" in updates and updates.get("base_url"):
+        filtered["base_url"] = normalize_base_url(updates.get("base_url"))
+        filtered["base_urls"] = [filtered["base_url"]]
     if not filtered:
         return await storage.async_get_entry(entry.entry_id)
     settings = await storage.async_set_entry(entry.entry_id, filtered)
     entry_data = domain_data.get("entries", {}).get(entry.entry_id)
     if entry_data:
         entry_data["settings"] = settings
-        if "base_url" in updates:
-            entry_data["client"].set_base_url(settings.get("base_url", DEFAULT_BASE_URL))
+        entry_data["client"].set_base_urls(_stored_base_urls(settings))
     return settings
 
 
-@dataclass
-class AddonConfig:
-    model: str | None = None
-    temperature: float | None = None
-    max_output_tokens: int | None = None
-    enable_web_search: bool | None = None
-    model_reasoning: str | None = None
-    model_fast: str | None = None
-    tts_model: str | None = None
-    stt_model: str | None = None
-    instruction: str | None = None
-    api_keys_present: dict[str, bool] | None = None
-    db_path: str | None = None
-
-
-async def _fetch_addon_config(
-    hass: HomeAssistant, entry: ConfigEntry, *, force: bool = False
-) -> AddonConfig | None:
-    entry_data = hass.data.get(DOMAIN, {}).get("entries", {}).get(entry.entry_id)
-    if not entry_data:
-        return None
-    now = asyncio.get_running_loop().time()
-    cached = entry_data.get("addon_config")
-    cached_ts = float(entry_data.get("addon_config_ts") or 0.0)
-    if cached and not force and (now - cached_ts) < 15:
-        return cached
-
-    base_url = entry_data.get("settings", {}).get("base_url", DEFAULT_BASE_URL)
-    session = aiohttp_client.async_get_clientsession(hass)
-    url = f"{base_url.rstrip('/')}/config"
-    try:
-        async with session.get(url, timeout=15) as resp:
-            payload = await resp.json()
-    except Exception as exc:  # noqa: BLE001
-        entry_data["addon_config_ts"] = now
-        entry_data["addon_config"] = None
-        _LOGGER.warning("Failed to fetch add-on config: %s", exc)
-        return None
-
-    config = payload.get("config") if isinstance(payload, dict) else None
-    if not isinstance(config, dict):
-        entry_data["addon_config_ts"] = now
-        entry_data["addon_config"] = None
-        return None
-
-    api_keys = config.get("api_keys") if isinstance(config.get("api_keys"), dict) else {}
-    parsed = AddonConfig(
-        model=config.get("model"),
-        temperature=config.get("temperature"),
-        max_output_tokens=config.get("max_output_tokens"),
-        enable_web_search=config.get("enable_web_search"),
-        model_reasoning=config.get("model_reasoning"),
-        model_fast=config.get("model_fast"),
-        tts_model=config.get("tts_model"),
-        stt_model=config.get("stt_model"),
-        instruction=config.get("instruction"),
-        api_keys_present={
-            "openai_api_key": bool(api_keys.get("openai_api_key")),
-            "anthropic_api_key": bool(api_keys.get("anthropic_api_key")),
-            "google_api_key": bool(api_keys.get("google_api_key")),
-        },
-        db_path=config.get("db_path"),
+def _entity_payload_item(
+    hass: HomeAssistant,
+    entry: er.RegistryEntry,
+    device_reg: dr.DeviceRegistry,
+    area_reg: ar.AreaRegistry,
+) -> EntityRecord:
+    device = device_reg.devices.get(entry.device_id) if entry.device_id else None
+    area_id = entry.area_id or (device.area_id if device else None)
+    area = area_reg.areas.get(area_id) if area_id else None
+    state = hass.states.get(entry.entity_id)
+    name = (
+        entry.name
+        or entry.original_name
+        or (state.attributes.get("friendly_name") if state else None)
+        or entry.entity_id
+    )
+    device_class = getattr(entry, "device_class", None) or (
+        state.attributes.get("device_class") if state else None
+    )
+    unit = getattr(entry, "unit_of_measurement", None) or (
+        state.attributes.get("unit_of_measurement") if state else None
     )
-    entry_data["addon_config"] = parsed
-    entry_data["addon_config_ts"] = now
-    return parsed
+    return EntityRecord.create(
+        entry.entity_id,
+        name,
+        device_class,
+        unit,
+        area.name if area else None,
+        device.name_by_user or device.name if device else None,
+    )
+
+
+def _track_loop(hass: HomeAssistant, section: str) -> AbstractContextManager[None]:
+    monitor: LoopLagMonitor | None = hass.data.get(DOMAIN, {}).get("loop_monitor")
+    if monitor is None:
+        return nullcontext()
+    return monitor.track(section)
 
 
-def _build_entity_payload(hass: HomeAssistant) -> list[dict[str, Any]]:
+async def _async_build_entity_payload(hass: HomeAssistant) -> list[EntityRecord]:
+    """Build the entity payload sorted by entity_id.
+
+    Registries are only safe to read on the event loop, so the work runs in
+    chunks that yield between them instead of moving to the executor.
+    """
     entity_reg = er.async_get(hass)
     device_reg = dr.async_get(hass)
     area_reg = ar.async_get(hass)
-    entities: list[dict[str, Any]] = []
-
-    for entry in entity_reg.entities.values():
-        device = device_reg.devices.get(entry.device_id) if entry.device_id else None
-        area_id = entry.area_id or (device.area_id if device else None)
-        area = area_reg.areas.get(area_id) if area_id else None
-        state = hass.states.get(entry.entity_id)
-        name = (
-            entry.name
-            or entry.original_name
-            or (state.attributes.get("friendly_name") if state else None)
-            or entry.entity_id
-        )
-        device_class = getattr(entry, "device_class", None) or (
-            state.attributes.get("device_class") if state else None
-        )
-        unit = getattr(entry, "unit_of_measurement", None) or (
-            state.attributes.get("unit_of_measurement") if state else None
-        )
+    registry_entries = list(entity_reg.entities.values())
+    entities: list[EntityRecord] = []
+
+    for start in range(0, len(registry_entries), ENTITY_PAYLOAD_CHUNK):
+        if start:
+            await asyncio.sleep(0)
+        with _track_loop(hass, "entity_payload"):
+            entities.extend(
+                _entity_payload_item(hass, entry, device_reg, area_reg)
+                for entry in registry_entries[start : start + ENTITY_PAYLOAD_CHUNK]
+            )
+
+    await asyncio.sleep(0)
+    with _track_loop(hass, "entity_payload_sort"):
+        entities.sort(key=attrgetter("entity_id"))
+    return entities
 
-        entities.append(
-            {
-                "entity_id": entry.entity_id,
-                "name": name,
-                "device_class": device_class,
-                "unit": unit,
-                "area": area.name if area else None,
-                "device": device.name_by_user or device.name if device else None,
-            }
-        )
 
+@callback
+def _async_track_registry_version(hass: HomeAssistant) -> list[CALLBACK_TYPE]:
+    """Bump the registry version whenever the entity payload may change.
+
+    Returns the unsubscribe callbacks of the bus listeners.
+    """
+    domain_data = hass.data[DOMAIN]
+
+    @callback
+    def _async_bump(_event: Event) -> None:
+        domain_data["registry_version"] += 1
+        domain_data["entity_payload"] = None
+
+    @callback
+    def _async_state_changed(event: Event) -> None:
+        # Names, device classes and units fall back to state attributes, which
+        # exist once an entity first reports a state and may change later.
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if old_state is None:
+            _async_bump(event)
+        elif new_state is not None and any(
+            old_state.attributes.get(key) != new_state.attributes.get(key)
+            for key in PAYLOAD_STATE_ATTRIBUTES
+        ):
+            _async_bump(event)
+
+    return [
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, _async_bump),
+        hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, _async_bump),
+        hass.bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, _async_bump),
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed),
+    ]
+
+
+async def _async_get_entity_payload(hass: HomeAssistant) -> list[EntityRecord]:
+    """Return the entity payload sorted by entity_id, cached per registry version.
+
+    Concurrent callers share one build. The returned list is shared; callers
+    must not mutate it.
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    version = domain_data.get("registry_version", 0)
+    cached = domain_data.get("entity_payload")
+    if cached and cached[0] == version:
+        cache_stats(hass, "entity_payload").record(True)
+        return cached[1]
+    pending = domain_data.get("entity_payload_build")
+    if pending and pending[0] == version:
+        cache_stats(hass, "entity_payload").record(True)
+        return await asyncio.shield(pending[1])
+    cache_stats(hass, "entity_payload").record(False)
+    start = time.perf_counter()
+    build = hass.async_create_task(_async_build_entity_payload(hass))
+    domain_data["entity_payload_build"] = (version, build)
+    try:
+        entities = await asyncio.shield(build)
+    finally:
+        if domain_data.get("entity_payload_build", (None, None))[1] is build:
+            domain_data["entity_payload_build"] = None
+    if DOMAIN in hass.data:
+        domain_data["entity_payload"] = (version, entities)
+        domain_data["entity_payload_timing"] = {
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+            "entities": len(entities),
+            "registry_version": version,
+            "built_at": dt_util.utcnow().isoformat(),
+        }
     return entities
 
 
+MAX_ENTITY_PAGE = 1000
+
+
+async def _async_encode_entities(
+    hass: HomeAssistant, page: list[Any], extra: dict[str, Any]
+) -> bytes:
+    """Encode ``{"entities": page, **extra}`` in slices that yield between.
+
+    orjson holds the GIL, so encoding in the executor would stall the loop
+    just as long; slices keep each stall to one chunk of entities. Records
+    are turned into dicts per slice, which orjson encodes much faster.
+    """
+    parts = [b'{"entities":[']
+    for start in range(0, len(page), ENTITY_PAYLOAD_CHUNK):
+        if start:
+            await asyncio.sleep(0)
+            parts.append(b",")
+        with _track_loop(hass, "entities_encode"):
+            chunk = page[start : start + ENTITY_PAYLOAD_CHUNK]
+            parts.append(json_bytes([entity_dict(entity) for entity in chunk])[1:-1])
+    parts.append(b"],")
+    parts.append(json_bytes(extra)[1:])
+    return b"".join(parts)
+
+
+def _query_set(request, key: str) -> set[str]:
+    raw = request.query.get(key, "")
+    return {value.strip().lower() for value in raw.split(",") if value.strip()}
+
+
+def _filter_entities(
+    entities: list[EntityRecord],
+    *,
+    domains: set[str],
+    areas: set[str],
+    device_classes: set[str],
+    text: str,
+) -> list[EntityRecord]:
+    if not (domains or areas or device_classes or text):
+        return entities
+    matched = []
+    for entity in entities:
+        entity_id = entity.entity_id
+        if domains and entity_id.split(".", 1)[0] not in domains:
+            continue
+        if areas and (entity.area or "").lower() not in areas:
+            continue
+        if device_classes and (entity.device_class or "").lower() not in device_classes:
+            continue
+        if text and not any(
+            text in (value or "").lower()
+            for value in (entity_id, entity.name, entity.area, entity.device)
+        ):
+            continue
+        matched.append(entity)
+    return matched
+
+
 class HAAgentEntitiesView(HomeAssistantView):
-    """Return registry data shaped for /entity/suggest."""
+    """Return registry data shaped for /entity/suggest.
+
+    Supports ``domain``, ``area`` and ``device_class`` filters (comma
+    separated), ``q`` text search, ``cursor``/``limit`` pagination ordered by
+    entity_id and ``fields`` projection. Responses carry a registry-version
+    ETag so unchanged registries answer ``If-None-Match`` with a 304.
+    """
 
     url = "/api/home_assistant_agent/entities"
     name = "api:home_assistant_agent:entities"
@@ -316,8 +603,81 @@ class HAAgentEntitiesView(HomeAssistantView):
 
     async def get(self, request):
         hass: HomeAssistant = request.app["hass"]
-        entities = _build_entity_payload(hass)
-        return self.json({"entities": entities})
+        domain_data = hass.data.get(DOMAIN, {})
+        etag = (
+            f'W/"{domain_data.get("registry_token", "")}-'
+            f'{domain_data.get("registry_version", 0)}"'
+        )
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if_none_match = request.headers.get("If-None-Match", "")
+        if if_none_match:
+            tags = {tag.strip() for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        limit: int | None = None
+        if "limit" in request.query:
+            try:
+                limit = int(request.query["limit"])
+            except ValueError:
+                return self.json({"error": "Invalid limit"}, status_code=400)
+            limit = max(1, min(limit, MAX_ENTITY_PAGE))
+        fields = [
+            field.strip()
+            for field in request.query.get("fields", "").split(",")
+            if field.strip()
+        ]
+        unknown = [field for field in fields if field not in ENTITY_FIELDS]
+        if unknown:
+            return self.json(
+                {"error": f"Unknown fields: {', '.join(unknown)}"}, status_code=400
+            )
+
+        entities = _filter_entities(
+            await _async_get_entity_payload(hass),
+            domains=_query_set(request, "domain"),
+            areas=_query_set(request, "area"),
+            device_classes=_query_set(request, "device_class"),
+            text=request.query.get("q", "").strip().lower(),
+        )
+        total = len(entities)
+        cursor = request.query.get("cursor")
+        start = 0
+        if cursor:
+            start = bisect_right(entities, cursor, key=attrgetter("entity_id"))
+        end = total if limit is None else min(start + limit, total)
+        page = entities[start:end]
+        if fields:
+            page = [entity.project(fields) for entity in page]
+        next_cursor = entities[end - 1].entity_id if end < total else None
+        body = await _async_encode_entities(
+            hass, page, {"total": total, "next_cursor": next_cursor}
+        )
+        return web.Response(
+            body=body, content_type="application/json", headers=headers
+        )
+
+
+def _key_present(addon_cfg: AddonConfig | None, key: str) -> bool:
+    return bool((addon_cfg.api_keys_present or {}).get(key)) if addon_cfg else False
+
+
+def _settings_response(
+    settings: dict[str, Any], addon_cfg: AddonConfig | None
+) -> dict[str, Any]:
+    return {
+        "base_url": settings.get("base_url", DEFAULT_BASE_URL),
+        "base_urls": settings.get("base_urls") or [DEFAULT_BASE_URL],
+        "version": addon_cfg.version if addon_cfg else None,
+        "openai_key_present": _key_present(addon_cfg, "openai_api_key"),
+        "anthropic_key_present": _key_present(addon_cfg, "anthropic_api_key"),
+        "gemini_key_present": _key_present(addon_cfg, "google_api_key"),
+        "model_reasoning": addon_cfg.model_reasoning if addon_cfg and addon_cfg.model_reasoning else "",
+        "model_fast": addon_cfg.model_fast if addon_cfg and addon_cfg.model_fast else "",
+        "tts_model": addon_cfg.tts_model if addon_cfg and addon_cfg.tts_model else "",
+        "stt_model": addon_cfg.stt_model if addon_cfg and addon_cfg.stt_model else "",
+        "instruction": addon_cfg.instruction if addon_cfg and addon_cfg.instruction else DEFAULT_INSTRUCTION,
+    }
 
 
 class HAAgentLLMKeyView(HomeAssistantView):
@@ -335,18 +695,15 @@ class HAAgentLLMKeyView(HomeAssistantView):
         entry, _client = _get_entry_and_client(hass, entry_id)
         if not entry:
             return self.json({"error": "No config entry found"}, status_code=400)
-        entry_data = hass.data.get(DOMAIN, {}).get("entries", {}).get(entry.entry_id, {})
-        base_url = entry_data.get("settings", {}).get("base_url", DEFAULT_BASE_URL)
-        session = aiohttp_client.async_get_clientsession(hass)
-        url = f"{base_url.rstrip('/')}/config"
-        body = {"openai_api_key": llm_key}
         try:
-            async with session.put(url, json=body, timeout=15) as resp:
-                data = await resp.json()
-        except Exception as exc:  # noqa: BLE001
-            return self.json({"error": f"Config update failed: {exc}"}, status_code=500)
+            # An empty key clears the stored one, as this view always has.
+            addon_cfg = await async_update_addon_config(
+                hass, entry.entry_id, {"openai_api_key": llm_key or None}
+            )
+        except HomeAssistantError as exc:
+            return self.json({"error": str(exc)}, status_code=500)
         return self.json(
-            {"status": "ok", "openai_key_present": bool((data or {}).get("config", {}).get("api_keys", {}).get("openai_api_key"))}
+            {"status": "ok", "openai_key_present": _key_present(addon_cfg, "openai_api_key")}
         )
 
 
@@ -364,21 +721,8 @@ class HAAgentSettingsView(HomeAssistantView):
         if not entry:
             return self.json({"error": "No config entry found"}, status_code=400)
         entry_data = hass.data.get(DOMAIN, {}).get("entries", {}).get(entry.entry_id, {})
-        settings = entry_data.get("settings", {})
-        addon_cfg = await _fetch_addon_config(hass, entry)
-        return self.json(
-            {
-                "base_url": settings.get("base_url", DEFAULT_BASE_URL),
-                "openai_key_present": bool((addon_cfg.api_keys_present or {}).get("openai_api_key")) if addon_cfg else False,
-                "anthropic_key_present": bool((addon_cfg.api_keys_present or {}).get("anthropic_api_key")) if addon_cfg else False,
-                "gemini_key_present": bool((addon_cfg.api_keys_present or {}).get("google_api_key")) if addon_cfg else False,
-                "model_reasoning": addon_cfg.model_reasoning if addon_cfg and addon_cfg.model_reasoning else "",
-                "model_fast": addon_cfg.model_fast if addon_cfg and addon_cfg.model_fast else "",
-                "tts_model": addon_cfg.tts_model if addon_cfg and addon_cfg.tts_model else "",
-                "stt_model": addon_cfg.stt_model if addon_cfg and addon_cfg.stt_model else "",
-                "instruction": addon_cfg.instruction if addon_cfg and addon_cfg.instruction else DEFAULT_INSTRUCTION,
-            }
-        )
+        addon_cfg = await async_get_addon_config(hass, entry.entry_id)
+        return self.json(_settings_response(entry_data.get("settings", {}), addon_cfg))
 
     async def post(self, request):
         hass: HomeAssistant = request.app["hass"]
@@ -391,6 +735,8 @@ class HAAgentSettingsView(HomeAssistantView):
         addon_updates: dict[str, Any] = {}
         if "base_url" in payload:
             updates["base_url"] = payload.get("base_url")
+        if isinstance(payload.get("base_urls"), list):
+            updates["base_urls"] = payload.get("base_urls")
         if "openai_key" in payload:
             addon_updates["openai_api_key"] = payload.get("openai_key")
         if "anthropic_key" in payload:
@@ -408,70 +754,50 @@ class HAAgentSettingsView(HomeAssistantView):
         if "instruction" in payload:
             addon_updates["instruction"] = payload.get("instruction")
 
-        settings = await _update_settings(hass, entry, updates)
-        entry_data = hass.data.get(DOMAIN, {}).get("entries", {}).get(entry.entry_id, {})
-        base_url = settings.get("base_url", DEFAULT_BASE_URL)
-        addon_cfg = None
-        if addon_updates:
-            session = aiohttp_client.async_get_clientsession(hass)
-            url = f"{base_url.rstrip('/')}/config"
-            try:
-                async with session.put(url, json=addon_updates, timeout=20) as resp:
-                    data = await resp.json()
-            except Exception as exc:  # noqa: BLE001
-                return self.json({"error": f"Config update failed: {exc}"}, status_code=500)
-            if isinstance(data, dict) and isinstance(data.get("config"), dict):
-                addon_cfg = data.get("config")
-        if addon_cfg:
-            entry_data["addon_config"] = AddonConfig(
-                model=addon_cfg.get("model"),
-                temperature=addon_cfg.get("temperature"),
-                max_output_tokens=addon_cfg.get("max_output_tokens"),
-                enable_web_search=addon_cfg.get("enable_web_search"),
-                model_reasoning=addon_cfg.get("model_reasoning"),
-                model_fast=addon_cfg.get("model_fast"),
-                tts_model=addon_cfg.get("tts_model"),
-                stt_model=addon_cfg.get("stt_model"),
-                instruction=addon_cfg.get("instruction"),
-                api_keys_present=addon_cfg.get("api_keys"),
-                db_path=addon_cfg.get("db_path"),
+        try:
+            settings = await _update_settings(hass, entry, updates)
+        except ValueError as exc:
+            return self.json({"error": str(exc)}, status_code=400)
+        try:
+            addon_cfg = await async_update_addon_config(
+                hass,
+                entry.entry_id,
+                addon_updates,
+                expected_version=payload.get("version"),
+                origin=payload.get("origin"),
             )
-            entry_data["addon_config_ts"] = asyncio.get_running_loop().time()
-        elif not addon_updates:
-            addon_cfg_obj = await _fetch_addon_config(hass, entry, force=True)
-            if addon_cfg_obj:
-                addon_cfg = {
-                    "model_reasoning": addon_cfg_obj.model_reasoning,
-                    "model_fast": addon_cfg_obj.model_fast,
-                    "tts_model": addon_cfg_obj.tts_model,
-                    "stt_model": addon_cfg_obj.stt_model,
-                    "instruction": addon_cfg_obj.instruction,
-                    "api_keys": addon_cfg_obj.api_keys_present,
-                }
+        except AddonConfigConflict as exc:
+            return self.json(
+                {
+                    "error": "Add-on config was changed elsewhere; reload and retry",
+                    **_settings_response(settings, exc.current),
+                },
+                status_code=HTTPStatus.CONFLICT,
+            )
+        except HomeAssistantError as exc:
+            return self.json({"error": str(exc)}, status_code=500)
         return self.json(
-            {
-                "status": "ok",
-                "base_url": settings.get("base_url", DEFAULT_BASE_URL),
-                "openai_key_present": bool((addon_cfg or {}).get("api_keys", {}).get("openai_api_key")) if addon_cfg else False,
-                "anthropic_key_present": bool((addon_cfg or {}).get("api_keys", {}).get("anthropic_api_key")) if addon_cfg else False,
-                "gemini_key_present": bool((addon_cfg or {}).get("api_keys", {}).get("google_api_key")) if addon_cfg else False,
-                "model_reasoning": addon_cfg.get("model_reasoning", "") if addon_cfg else "",
-                "model_fast": addon_cfg.get("model_fast", "") if addon_cfg else "",
-                "tts_model": addon_cfg.get("tts_model", "") if addon_cfg else "",
-                "stt_model": addon_cfg.get("stt_model", "") if addon_cfg else "",
-                "instruction": addon_cfg.get("instruction", DEFAULT_INSTRUCTION) if addon_cfg else DEFAULT_INSTRUCTION,
-                "validation": None,
-            }
+            {"status": "ok", **_settings_response(settings, addon_cfg), "validation": None}
         )
 
 
 class HAAgentSuggestView(HomeAssistantView):
-    """Proxy /entity/suggest to ha_agent_core."""
+    """Serve cached suggestions and refresh changed entities via ha_agent_core."""
 
     url = "/api/home_assistant_agent/suggest"
     name = "api:home_assistant_agent:suggest"
     requires_auth = True
 
+    async def get(self, request):
+        hass: HomeAssistant = request.app["hass"]
+        cache: HAAgentSuggestionCache = hass.data[DOMAIN]["suggestions"]
+        return self.json(
+            {
+                "suggestions": await cache.async_cached(),
+                "progress": cache.progress,
+            }
+        )
+
     async def post(self, request):
         hass: HomeAssistant = request.app["hass"]
         payload = await request.json()
@@ -482,18 +808,34 @@ class HAAgentSuggestView(HomeAssistantView):
 
         model = payload.get("model")
         if not model:
-            addon_cfg = await _fetch_addon_config(hass, entry)
+            addon_cfg = await async_get_addon_config(hass, entry.entry_id)
             if addon_cfg:
                 model = addon_cfg.model_reasoning or addon_cfg.model_fast
         llm_key = payload.get("llm_key")
-        entities = payload.get("entities") or _build_entity_payload(hass)
-        result = await client.async_entity_suggest(
-            entities=entities,
+        entities = payload.get("entities")
+        full_registry = not entities
+        if full_registry:
+            entities = await _async_get_entity_payload(hass)
+
+        cache: HAAgentSuggestionCache = hass.data[DOMAIN]["suggestions"]
+        cached, stale = await cache.async_partition(entities, prune=full_registry)
+        if payload.get("force"):
+            stale = entities
+        started = cache.async_start_refresh(
+            client,
+            stale,
             use_llm=payload.get("use_llm"),
             api_key=llm_key if llm_key else None,
             model=model,
         )
-        return self.json(result)
+        return self.json(
+            {
+                "suggestions": cached,
+                "pending": len(stale),
+                "started": started,
+                "progress": cache.progress,
+            }
+        )
 
 
 class HAAgentHealthView(HomeAssistantView):
@@ -511,17 +853,26 @@ class HAAgentHealthView(HomeAssistantView):
             return self.json({"status": "error", "error": "No config entry found"}, status_code=400)
 
         entry_data = hass.data.get(DOMAIN, {}).get("entries", {}).get(entry.entry_id, {})
-        settings = entry_data.get("settings", {})
-        base_url = settings.get("base_url", DEFAULT_BASE_URL)
+        client: HAAgentApi | None = entry_data.get("client")
+        if client:
+            await client.async_probe_backends()
+        backends = client.backend_stats() if client else []
+        base_url = routed_base_url(entry_data)
         session = aiohttp_client.async_get_clientsession(hass)
         url = f"{base_url.rstrip('/')}/config"
         try:
-            async with session.get(url, timeout=10) as resp:
+            async with session.get(url, timeout=HEALTH_CHECK_TIMEOUT) as resp:
                 payload = await resp.json()
         except Exception as exc:  # noqa: BLE001
-            return self.json({"status": "error", "error": str(exc)})
+            return self.json({"status": "error", "error": str(exc), "backends": backends})
 
         if not isinstance(payload, dict) or payload.get("status") != "success":
-            return self.json({"status": "error", "error": "Invalid response from add-on"})
+            return self.json(
+                {
+                    "status": "error",
+                    "error": "Invalid response from add-on",
+                    "backends": backends,
+                }
+            )
 
-        return self.json({"status": "success"})
+        return self.json({"status": "success", "backend": base_url, "backends": backends})
@@ -0,0 +1,323 @@
+"""Versioned cache of the ha_agent_core add-on config document."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, replace
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .api import Deadline, HAAgentApi
+from .const import (
+    ADDON_CONFIG_DEADLINE_SHARE,
+    ADDON_CONFIG_TIMEOUT,
+    ADDON_CONFIG_UPDATE_TIMEOUT,
+    DEFAULT_BASE_URL,
+    DOMAIN,
+    SIGNAL_ADDON_CONFIG_UPDATED,
+)
+from .stats import cache_stats
+
+_LOGGER = logging.getLogger(__name__)
+
+# A cached document older than this is still served, but revalidated in the
+# background.
+ADDON_CONFIG_TTL = 15
+ADDON_CONFIG_FIELDS = (
+    "model_reasoning",
+    "model_fast",
+    "tts_model",
+    "stt_model",
+    "instruction",
+)
+API_KEY_FIELDS = ("openai_api_key", "anthropic_api_key", "google_api_key")
+
+
+class AddonConfigConflict(HomeAssistantError):
+    """Raised when the add-on config changed since the version a write expected."""
+
+    def __init__(self, current: AddonConfig | None) -> None:
+        super().__init__("Add-on config was changed elsewhere")
+        self.current = current
+
+
+@dataclass
+class AddonConfig:
+    model: str | None = None
+    temperature: float | None = None
+    max_output_tokens: int | None = None
+    enable_web_search: bool | None = None
+    model_reasoning: str | None = None
+    model_fast: str | None = None
+    tts_model: str | None = None
+    stt_model: str | None = None
+    instruction: str | None = None
+    api_keys_present: dict[str, bool] | None = None
+    db_path: str | None = None
+    version: str | None = None
+
+
+def parse_addon_config(payload: Any) -> AddonConfig | None:
+    """Build an AddonConfig from a ``/config`` response body."""
+    config = payload.get("config") if isinstance(payload, dict) else None
+    if not isinstance(config, dict):
+        return None
+    version = payload.get("version", config.get("version"))
+    api_keys = config.get("api_keys") if isinstance(config.get("api_keys"), dict) else {}
+    return AddonConfig(
+        model=config.get("model"),
+        temperature=config.get("temperature"),
+        max_output_tokens=config.get("max_output_tokens"),
+        enable_web_search=config.get("enable_web_search"),
+        model_reasoning=config.get("model_reasoning"),
+        model_fast=config.get("model_fast"),
+        tts_model=config.get("tts_model"),
+        stt_model=config.get("stt_model"),
+        instruction=config.get("instruction"),
+        api_keys_present={key: bool(api_keys.get(key)) for key in API_KEY_FIELDS},
+        db_path=config.get("db_path"),
+        version=None if version is None else str(version),
+    )
+
+
+def routed_base_url(entry_data: dict[str, Any]) -> str:
+    """Return the base URL of the backend the entry's client currently prefers."""
+    client: HAAgentApi | None = entry_data.get("client")
+    if client:
+        return client.base_url
+    return entry_data.get("settings", {}).get("base_url", DEFAULT_BASE_URL)
+
+
+def _entry_data(hass: HomeAssistant, entry_id: str) -> dict[str, Any] | None:
+    return hass.data.get(DOMAIN, {}).get("entries", {}).get(entry_id)
+
+
+@callback
+def _async_store(
+    hass: HomeAssistant,
+    entry_id: str,
+    entry_data: dict[str, Any],
+    config: AddonConfig,
+    origin: str | None = None,
+) -> None:
+    """Cache ``config`` and signal a change, tagged with the writer's ``origin``."""
+    previous: AddonConfig | None = entry_data.get("addon_config")
+    entry_data["addon_config"] = config
+    entry_data["addon_config_ts"] = asyncio.get_running_loop().time()
+    if previous != config:
+        async_dispatcher_send(
+            hass, SIGNAL_ADDON_CONFIG_UPDATED, entry_id, config.version, origin
+        )
+
+
+async def _async_fetch(
+    hass: HomeAssistant, entry_id: str, entry_data: dict[str, Any], timeout: float
+) -> AddonConfig | None:
+    """GET the document, conditionally on the cached version when there is one."""
+    cached: AddonConfig | None = entry_data.get("addon_config")
+    headers = {}
+    if cached is not None and cached.version is not None:
+        headers["If-None-Match"] = f'"{cached.version}"'
+    session = aiohttp_client.async_get_clientsession(hass)
+    url = f"{routed_base_url(entry_data).rstrip('/')}/config"
+    try:
+        async with session.get(url, headers=headers, timeout=timeout) as resp:
+            if resp.status == 304 and cached is not None:
+                entry_data["addon_config_ts"] = asyncio.get_running_loop().time()
+                return cached
+            payload = await resp.json()
+    except Exception as exc:  # noqa: BLE001
+        # Keep serving the last known document while the add-on is away.
+        entry_data["addon_config_ts"] = asyncio.get_running_loop().time()
+        _LOGGER.debug("Failed to fetch add-on config: %s", exc)
+        return cached
+    parsed = parse_addon_config(payload)
+    if parsed is None:
+        entry_data["addon_config_ts"] = asyncio.get_running_loop().time()
+        return cached
+    _async_store(hass, entry_id, entry_data, parsed)
+    return parsed
+
+
+@callback
+def _async_schedule_revalidate(
+    hass: HomeAssistant, entry_id: str, entry_data: dict[str, Any]
+) -> None:
+    task: asyncio.Task | None = entry_data.get("addon_config_refresh")
+    if task is not None and not task.done():
+        return
+    entry_data["addon_config_refresh"] = hass.async_create_background_task(
+        _async_fetch(hass, entry_id, entry_data, ADDON_CONFIG_TIMEOUT),
+        "home_assistant_agent add-on config revalidation",
+    )
+
+
+async def async_get_addon_config(
+    hass: HomeAssistant,
+    entry_id: str,
+    *,
+    deadline: Deadline | None = None,
+    refresh: bool = False,
+) -> AddonConfig | None:
+    """Return the add-on config; only a cold cache waits on the add-on.
+
+    A document older than ``ADDON_CONFIG_TTL`` is returned as-is while a
+    conditional GET revalidates it in the background. A failed fetch is not
+    retried until the TTL has passed.
+    """
+    entry_data = _entry_data(hass, entry_id)
+    if not entry_data:
+        return None
+    stats = cache_stats(hass, "addon_config")
+    cached: AddonConfig | None = entry_data.get("addon_config")
+    fetched = float(entry_data.get("addon_config_ts") or 0.0)
+    fresh = bool(fetched) and (
+        asyncio.get_running_loop().time() - fetched < ADDON_CONFIG_TTL
+    )
+    if not refresh and (cached is not None or fresh):
+        stats.record(True)
+        if not fresh:
+            _async_schedule_revalidate(hass, entry_id, entry_data)
+        return cached
+    stats.record(False)
+
+    timeout = ADDON_CONFIG_TIMEOUT
+    if deadline is not None:
+        # The lookup is optional, so it must never starve the chat request.
+        timeout = min(timeout, deadline.budget * ADDON_CONFIG_DEADLINE_SHARE)
+        if deadline.remaining() <= timeout:
+            return cached
+    return await _async_fetch(hass, entry_id, entry_data, timeout)
+
+
+def _changed_fields(
+    cached: AddonConfig | None, updates: dict[str, Any]
+) -> dict[str, Any]:
+    """Keep only updates that differ from the cached document.
+
+    Empty strings and None both mean "not set". API keys are write-only, so
+    a non-empty key always counts as a change, an empty one as "leave
+    unchanged" and None as "clear the stored key".
+    """
+    changed: dict[str, Any] = {}
+    for key, value in updates.items():
+        if key in API_KEY_FIELDS:
+            if value is None:
+                if cached is None or _key_stored(cached, key):
+                    changed[key] = ""
+            elif value:
+                changed[key] = value
+        elif cached is None or (getattr(cached, key, None) or None) != (value or None):
+            changed[key] = value
+    return changed
+
+
+def _key_stored(config: AddonConfig, key: str) -> bool:
+    return bool((config.api_keys_present or {}).get(key))
+
+
+async def _async_put(
+    hass: HomeAssistant, base_url: str, changed: dict[str, Any], headers: dict[str, str]
+) -> tuple[int, Any]:
+    session = aiohttp_client.async_get_clientsession(hass)
+    async with session.put(
+        f"{base_url.rstrip('/')}/config",
+        json=changed,
+        headers=headers,
+        timeout=ADDON_CONFIG_UPDATE_TIMEOUT,
+    ) as resp:
+        return resp.status, await resp.json(content_type=None)
+
+
+async def _async_fan_out(
+    hass: HomeAssistant, base_urls: list[str], changed: dict[str, Any]
+) -> None:
+    results = await asyncio.gather(
+        *(_async_put(hass, base_url, changed, {}) for base_url in base_urls),
+        return_exceptions=True,
+    )
+    for base_url, result in zip(base_urls, results):
+        if isinstance(result, BaseException) or result[0] >= 400:
+            _LOGGER.warning(
+                "Add-on config update did not reach %s: %s",
+                base_url,
+                result if isinstance(result, BaseException) else f"HTTP {result[0]}",
+            )
+
+
+async def async_update_addon_config(
+    hass: HomeAssistant,
+    entry_id: str,
+    updates: dict[str, Any],
+    *,
+    expected_version: str | None = None,
+    origin: str | None = None,
+) -> AddonConfig | None:
+    """Send changed fields to the add-on and update the cache from the reply.
+
+    The write carries the expected version in ``If-Match``; a 409 or 412
+    raises AddonConfigConflict with the current document, as does an
+    ``expected_version`` that the refreshed cache no longer has. Other backends of
+    the entry receive the same change in the background. ``origin`` is
+    passed on with the update signal so the writer can ignore its own echo.
+    """
+    entry_data = _entry_data(hass, entry_id)
+    if not entry_data:
+        return None
+    cached = await async_get_addon_config(hass, entry_id)
+    if expected_version is not None and (
+        cached is None or cached.version != expected_version
+    ):
+        # The writer saw a version the cache does not have; diffing against
+        # the stale copy could drop fields that differ on the add-on.
+        cached = await async_get_addon_config(hass, entry_id, refresh=True)
+        if cached is not None and cached.version not in (None, expected_version):
+            raise AddonConfigConflict(cached)
+    changed = _changed_fields(cached, updates)
+    if not changed:
+        return cached
+    if expected_version is None and cached is not None:
+        expected_version = cached.version
+    headers = {}
+    if expected_version is not None:
+        headers["If-Match"] = f'"{expected_version}"'
+
+    primary = routed_base_url(entry_data)
+    try:
+        status, data = await _async_put(hass, primary, changed, headers)
+    except Exception as exc:  # noqa: BLE001
+        raise HomeAssistantError(f"Config update failed: {exc}") from exc
+    if status in (409, 412):
+        raise AddonConfigConflict(
+            await async_get_addon_config(hass, entry_id, refresh=True)
+        )
+    if status >= 400:
+        raise HomeAssistantError(f"Config update failed: HTTP {status}")
+
+    config = parse_addon_config(data)
+    if config is None:
+        # The reply has no document; apply the change to the cached copy.
+        version = data.get("version") if isinstance(data, dict) else None
+        keys = dict((cached.api_keys_present if cached else None) or {})
+        keys.update({key: bool(changed[key]) for key in API_KEY_FIELDS if key in changed})
+        config = replace(
+            cached or AddonConfig(),
+            **{key: changed[key] for key in ADDON_CONFIG_FIELDS if key in changed},
+            api_keys_present=keys,
+            version=None if version is None else str(version),
+        )
+    _async_store(hass, entry_id, entry_data, config, origin)
+
+    client: HAAgentApi | None = entry_data.get("client")
+    others = [url for url in (client.base_urls if client else []) if url != primary]
+    if others:
+        hass.async_create_background_task(
+            _async_fan_out(hass, others, changed),
+            "home_assistant_agent add-on config fan-out",
+        )
+    return config
@@ -3,10 +3,155 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, NoReturn
 
 import aiohttp
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.json import json_loads
+from yarl import URL
+
+from .history import ConversationHistoryCache, ConversationState, journal_names_key
+from .loop_monitor import LoopLagMonitor
+from .memory_index import MemoryIndex
+
+# Weight of the newest sample in the per-backend latency EWMA.
+LATENCY_EWMA_ALPHA = 0.3
+PROBE_TIMEOUT = 5.0
+MAX_STICKY_CONVERSATIONS = 512
+RECENT_SAMPLES = 20
+# Statuses from a proxy or an overloaded core; another backend may answer.
+FAILOVER_STATUSES = frozenset({502, 503, 504})
+# Paths whose duration is dominated by model work rather than the backend;
+# they are left out of the latency EWMA used for routing. The streaming STT
+# and TTS calls never feed it either.
+UNTIMED_PATHS = frozenset({"/chat", "/entity/suggest"})
+RECENT_ERRORS = 5
+AUDIO_CHUNK_SIZE = 4096
+JOURNAL_FETCH_CONCURRENCY = 4
+# How long, in seconds, to skip /journals/batch after a core lacked it; the
+# add-on may be upgraded or fail over to a newer backend in the meantime.
+JOURNAL_BATCH_RETRY = 600.0
+# Remaining budget, in milliseconds, sent with deadline-bound requests so the
+# core can pick a faster model or trim history when time is short.
+DEADLINE_HEADER = "X-HA-Agent-Deadline-Ms"
+
+
+class HAAgentResponseError(HomeAssistantError):
+    """Raised when ha_agent_core answers with an HTTP error status."""
+
+    def __init__(self, status: int, data: Any) -> None:
+        super().__init__(f"Home Assistant Agent error {status}: {data}")
+        self.status = status
+        self.data = data
+
+
+class DeadlineExceeded(HomeAssistantError):
+    """Raised when a request's end-to-end deadline has run out."""
+
+
+class Deadline:
+    """An absolute point in event-loop time that a whole operation must meet."""
+
+    def __init__(self, budget: float) -> None:
+        self.budget = budget
+        self.expires = asyncio.get_running_loop().time() + budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - asyncio.get_running_loop().time())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, cap: float | None = None) -> float:
+        """Return the time left, limited to ``cap``; raise if none is left."""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline exceeded")
+        return remaining if cap is None else min(cap, remaining)
+
+
+def normalize_base_url(base_url: Any) -> str:
+    """Return ``base_url`` without a trailing slash; raise if it is not http(s)."""
+    url = str(base_url or "").strip().rstrip("/")
+    try:
+        parsed = URL(url)
+    except ValueError as err:
+        raise ValueError(f"Invalid base URL: {base_url!r}") from err
+    if parsed.scheme not in ("http", "https") or not parsed.host:
+        raise ValueError(f"Invalid base URL: {base_url!r}")
+    return url
+
+
+@dataclass
+class Backend:
+    """Routing state for a single ha_agent_core instance."""
+
+    url: str
+    latency: float | None = None
+    healthy: bool = True
+    requests: int = 0
+    errors: int = 0
+    last_error: str | None = None
+    last_checked: float | None = None
+
+    def mark_answered(self, now: float) -> None:
+        self.healthy = True
+        self.last_checked = now
+
+    def mark_failed(self, error: str, now: float) -> None:
+        """Count a transport error or 5xx answer; 5xx fails a probe too."""
+        self.errors += 1
+        self.healthy = False
+        self.last_error = error
+        self.last_checked = now
+
+    def record_latency(self, sample: float) -> None:
+        if self.latency is None:
+            self.latency = sample
+        else:
+            self.latency = (
+                LATENCY_EWMA_ALPHA * sample + (1 - LATENCY_EWMA_ALPHA) * self.latency
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency * 1000, 1)
+            if self.latency is not None
+            else None,
+            "requests": self.requests,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+@dataclass
+class EndpointStats:
+    """Recent latencies and errors for one ``METHOD /path`` pair."""
+
+    requests: int = 0
+    errors: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=RECENT_SAMPLES))
+    recent_errors: deque[str] = field(default_factory=lambda: deque(maxlen=RECENT_ERRORS))
+
+    def as_dict(self) -> dict[str, Any]:
+        samples = sorted(self.latencies)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "recent_latency_ms": [round(sample * 1000, 1) for sample in self.latencies],
+            "median_latency_ms": round(samples[len(samples) // 2] * 1000, 1)
+            if samples
+            else None,
+            "max_latency_ms": round(samples[-1] * 1000, 1) if samples else None,
+            "recent_errors": list(self.recent_errors),
+        }
 
 
 class HAAgentApi:
@@ -14,22 +159,167 @@ class HAAgentApi:
 
     def __init__(
         self,
-        base_url: str,
+        base_url: str | list[str],
         session: aiohttp.ClientSession,
         auth_key: str | None = None,
         timeout: float = 15.0,
+        loop_monitor: LoopLagMonitor | None = None,
     ) -> None:
         self._session = session
+        self._loop_monitor = loop_monitor
         self._timeout = aiohttp.ClientTimeout(total=timeout)
-        self.set_base_url(base_url)
+        self._backends: list[Backend] = []
+        self._sticky: OrderedDict[str, str] = OrderedDict()
+        self._endpoint_stats: dict[str, EndpointStats] = {}
+        self._history = ConversationHistoryCache()
+        self._journal_inflight: dict[str, asyncio.Future[dict[str, Any]]] = {}
+        self._journal_tasks: set[asyncio.Task] = set()
+        # Loop time at which /journals/batch was last found missing.
+        self._journal_batch_missing: float | None = None
+        self._memory_index: MemoryIndex | None = None
+        if isinstance(base_url, str):
+            self.set_base_url(base_url)
+        else:
+            self.set_base_urls(base_url)
         self.set_auth_key(auth_key)
 
     def set_base_url(self, base_url: str) -> None:
-        self._base_url = base_url.rstrip("/")
+        self.set_base_urls([base_url])
+
+    def set_base_urls(self, base_urls: list[str]) -> None:
+        """Replace the ordered backend list, keeping stats for known URLs."""
+        known = {backend.url: backend for backend in self._backends}
+        backends: list[Backend] = []
+        for base_url in base_urls:
+            url = normalize_base_url(base_url)
+            if url not in (backend.url for backend in backends):
+                backends.append(known.get(url) or Backend(url))
+        if not backends:
+            raise ValueError("At least one base URL is required")
+        if [backend.url for backend in backends] != self.base_urls:
+            # New backends may support endpoints the old ones lacked.
+            self._journal_batch_missing = None
+        self._backends = backends
+        urls = {backend.url for backend in backends}
+        for conversation_id, url in list(self._sticky.items()):
+            if url not in urls:
+                del self._sticky[conversation_id]
 
     def set_auth_key(self, auth_key: str | None) -> None:
         self._auth_key = auth_key
 
+    def set_memory_index(self, index: MemoryIndex | None) -> None:
+        """Answer memory queries from ``index`` while it is fresh."""
+        self._memory_index = index
+
+    @property
+    def memory_index(self) -> MemoryIndex | None:
+        return self._memory_index
+
+    @property
+    def base_url(self) -> str:
+        """Return the URL of the backend requests are currently routed to."""
+        return self._ordered_backends()[0].url
+
+    @property
+    def base_urls(self) -> list[str]:
+        return [backend.url for backend in self._backends]
+
+    def backend_stats(self) -> list[dict[str, Any]]:
+        return [backend.as_dict() for backend in self._backends]
+
+    @property
+    def cached_conversations(self) -> int:
+        return len(self._history)
+
+    def endpoint_stats(self) -> dict[str, dict[str, Any]]:
+        return {key: stats.as_dict() for key, stats in self._endpoint_stats.items()}
+
+    def _stats_for(self, method: str, path: str) -> EndpointStats:
+        key = f"{method} {path}"
+        stats = self._endpoint_stats.get(key)
+        if stats is None:
+            stats = self._endpoint_stats[key] = EndpointStats()
+        return stats
+
+    def _ordered_backends(self, prefer: str | None = None) -> list[Backend]:
+        """Order backends: sticky preference, then healthy by EWMA latency.
+
+        Backends without a latency sample sort first so they get measured;
+        ties keep the configured order.
+        """
+        ranked = sorted(
+            enumerate(self._backends),
+            key=lambda item: (
+                not item[1].healthy,
+                item[1].latency or 0.0,
+                item[0],
+            ),
+        )
+        ordered = [backend for _index, backend in ranked]
+        if prefer:
+            for backend in ordered:
+                if backend.url == prefer and backend.healthy:
+                    ordered.remove(backend)
+                    ordered.insert(0, backend)
+                    break
+        return ordered
+
+    def _track(self, section: str) -> AbstractContextManager[None]:
+        if self._loop_monitor is None:
+            return nullcontext()
+        return self._loop_monitor.track(section)
+
+    async def _decode_json(self, resp: aiohttp.ClientResponse) -> Any:
+        """Read and decode a JSON body; an empty body decodes to ``{}``.
+
+        A body that is not JSON raises ``HAAgentResponseError``: the core did
+        answer, so this is not a transport error to fail over on.
+        """
+        body = await resp.read()
+        if not body.strip():
+            return {}
+        try:
+            with self._track("json_decode"):
+                return json_loads(body)
+        except ValueError as err:
+            raise HAAgentResponseError(
+                resp.status, f"Invalid JSON response: {err}"
+            ) from err
+
+    async def _decode_answer(self, resp: aiohttp.ClientResponse) -> Any:
+        """Decode a body like ``_decode_json``, keeping 5xx pages as text.
+
+        Proxies answer 502-504 with HTML; the status is what matters there.
+        """
+        if resp.status < 500:
+            return await self._decode_json(resp)
+        try:
+            return await self._decode_json(resp)
+        except HAAgentResponseError:
+            return f"HTTP {resp.status}"
+
+    def _raise_unanswered(
+        self, stats: EndpointStats, last_err: Exception | None
+    ) -> NoReturn:
+        """Record and raise the error of a request no backend answered."""
+        stats.errors += 1
+        if isinstance(last_err, HAAgentResponseError):
+            stats.recent_errors.append(f"HTTP {last_err.status}: {last_err.data}")
+            raise last_err
+        stats.recent_errors.append(
+            f"{type(last_err).__name__}: {last_err}" if last_err else "no backend"
+        )
+        raise HomeAssistantError(
+            "Error communicating with Home Assistant Agent"
+        ) from last_err
+
+    def _headers(self) -> dict[str, str]:
+        headers = {}
+        if self._auth_key:
+            headers["Authorization"] = f"Bearer {self._auth_key}"
+        return headers
+
     async def _request(
         self,
         method: str,
@@ -37,30 +327,123 @@ class HAAgentApi:
         *,
         params: dict[str, Any] | None = None,
         json_data: dict[str, Any] | None = None,
+        idempotent: bool = True,
     ) -> dict[str, Any]:
-        url = f"{self._base_url}{path}"
-        headers = {}
-        if self._auth_key:
-            headers["Authorization"] = f"Bearer {self._auth_key}"
+        data, _backend = await self._request_routed(
+            method, path, params=params, json_data=json_data, idempotent=idempotent
+        )
+        return data
+
+    async def _request_routed(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        json_data: dict[str, Any] | None = None,
+        prefer: str | None = None,
+        deadline: Deadline | None = None,
+        idempotent: bool = True,
+    ) -> tuple[dict[str, Any], Backend]:
+        """Send a request, failing over to the next backend on transport errors.
+
+        Idempotent requests also fail over on ``FAILOVER_STATUSES``, and any
+        5xx answer marks the backend unhealthy, as a failed probe does.
+        Requests that are not ``idempotent`` only fail over when the
+        connection could not be made; once the body may have reached a core,
+        resending it elsewhere could run it twice. With a ``deadline`` each
+        attempt is limited to the remaining budget, which is also sent to the
+        core in ``DEADLINE_HEADER``.
+        """
+        loop = asyncio.get_running_loop()
+        stats = self._stats_for(method, path)
+        stats.requests += 1
+        request_start = loop.time()
+        last_err: Exception | None = None
+        for backend in self._ordered_backends(prefer):
+            timeout = self._timeout
+            headers = self._headers()
+            if deadline is not None:
+                try:
+                    budget = deadline.timeout(self._timeout.total)
+                except DeadlineExceeded:
+                    stats.errors += 1
+                    stats.recent_errors.append("deadline exceeded")
+                    raise
+                timeout = aiohttp.ClientTimeout(total=budget)
+                headers[DEADLINE_HEADER] = str(int(deadline.remaining() * 1000))
+            start = loop.time()
+            backend.requests += 1
+            try:
+                async with self._session.request(
+                    method,
+                    f"{backend.url}{path}",
+                    params=params,
+                    json=json_data,
+                    headers=headers,
+                    timeout=timeout,
+                ) as resp:
+                    data = await self._decode_answer(resp)
+            except HAAgentResponseError as err:
+                backend.mark_answered(loop.time())
+                stats.errors += 1
+                stats.recent_errors.append(f"{backend.url}: {err.data}")
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if deadline is not None and deadline.expired:
+                    # Our budget ran out; that says nothing about the backend.
+                    stats.errors += 1
+                    stats.recent_errors.append("deadline exceeded")
+                    raise DeadlineExceeded("Deadline exceeded") from err
+                backend.mark_failed(str(err) or type(err).__name__, loop.time())
+                last_err = err
+                if not idempotent and not isinstance(err, aiohttp.ClientConnectorError):
+                    break
+                continue
+            if resp.status >= 500:
+                backend.mark_failed(f"HTTP {resp.status}", loop.time())
+                last_err = HAAgentResponseError(resp.status, data)
+                if idempotent and resp.status in FAILOVER_STATUSES:
+                    continue
+                break
+            if path not in UNTIMED_PATHS:
+                backend.record_latency(loop.time() - start)
+            backend.mark_answered(loop.time())
+            stats.latencies.append(loop.time() - request_start)
+            if resp.status >= 400:
+                stats.errors += 1
+                stats.recent_errors.append(f"{backend.url}: HTTP {resp.status}")
+                raise HAAgentResponseError(resp.status, data)
+            return data, backend
+        self._raise_unanswered(stats, last_err)
+
+    async def _probe(self, backend: Backend) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
         try:
-            async with self._session.request(
-                method,
-                url,
-                params=params,
-                json=json_data,
-                headers=headers,
-                timeout=self._timeout,
+            async with self._session.get(
+                f"{backend.url}/health",
+                headers=self._headers(),
+                timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT),
             ) as resp:
-                data = await resp.json()
-                if resp.status >= 400:
-                    raise HomeAssistantError(
-                        f"Home Assistant Agent error {resp.status}: {data}"
-                    )
-                return data
+                await resp.read()
+                status = resp.status
         except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-            raise HomeAssistantError(
-                "Error communicating with Home Assistant Agent"
-            ) from err
+            backend.healthy = False
+            backend.last_error = str(err) or type(err).__name__
+        else:
+            backend.healthy = status < 500
+            if backend.healthy:
+                backend.record_latency(loop.time() - start)
+            else:
+                backend.last_error = f"HTTP {status}"
+        backend.last_checked = loop.time()
+
+    async def async_probe_backends(self) -> None:
+        """Actively measure every backend so idle ones keep fresh latencies."""
+        if len(self._backends) < 2:
+            return
+        await asyncio.gather(*(self._probe(backend) for backend in self._backends))
 
     async def async_chat(
         self,
@@ -73,6 +456,7 @@ class HAAgentApi:
         api_key: str | None = None,
         model: str | None = None,
         default_reply: str | None = None,
+        deadline: Deadline | None = None,
     ) -> dict[str, Any]:
         payload: dict[str, Any] = {"text": text}
         if conversation_id:
@@ -81,15 +465,93 @@ class HAAgentApi:
             payload["history_limit"] = history_limit
         if use_llm is not None:
             payload["use_llm"] = use_llm
-        if journal_names is not None:
-            payload["journal_names"] = journal_names
         if api_key:
             payload["api_key"] = api_key
         if model:
             payload["model"] = model
         if default_reply:
             payload["default_reply"] = default_reply
-        return await self._request("POST", "/chat", json_data=payload)
+        journal_key = journal_names_key(journal_names)
+        state = self._history.get(conversation_id)
+        prefer = self._sticky.get(conversation_id) if conversation_id else None
+        try:
+            data, backend = await self._request_routed(
+                "POST",
+                "/chat",
+                json_data=self._chat_delta(payload, state, journal_names, journal_key),
+                prefer=prefer,
+                deadline=deadline,
+                idempotent=False,
+            )
+        except HAAgentResponseError as err:
+            if err.status != 409 or state is None:
+                raise
+            # The core lost or never had our history (restart or failover):
+            # resend the full cached conversation once.
+            data, backend = await self._request_routed(
+                "POST",
+                "/chat",
+                json_data=self._chat_full(payload, state, journal_names),
+                prefer=prefer,
+                deadline=deadline,
+                idempotent=False,
+            )
+        # Keep follow-up turns on the backend that holds the history.
+        served_id = data.get("conversation_id") if isinstance(data, dict) else None
+        for key in {conversation_id, served_id}:
+            if key:
+                self._sticky[key] = backend.url
+                self._sticky.move_to_end(key)
+        while len(self._sticky) > MAX_STICKY_CONVERSATIONS:
+            self._sticky.popitem(last=False)
+        if isinstance(data, dict) and (served_id or conversation_id):
+            if served_id and conversation_id and served_id != conversation_id:
+                self._history.discard(conversation_id)
+            self._history.record_turn(
+                served_id or conversation_id,
+                text,
+                data.get("response"),
+                previous=state if served_id in (None, conversation_id) else None,
+                version=data.get("history_version"),
+                journal_key=journal_key,
+                journal_hash=data.get("journal_hash"),
+            )
+        return data
+
+    @staticmethod
+    def _chat_delta(
+        payload: dict[str, Any],
+        state: ConversationState | None,
+        journal_names: list[str] | None,
+        journal_key: str | None,
+    ) -> dict[str, Any]:
+        """Build a turn carrying only the new message and references.
+
+        Without a known history version this is a regular full turn, so
+        cores that do not version history keep working unchanged.
+        """
+        if state is None or state.version is None:
+            return HAAgentApi._chat_full(payload, None, journal_names)
+        delta = {**payload, "history_version": state.version}
+        if journal_names is not None:
+            if state.journal_hash and state.journal_key == journal_key:
+                delta["journal_hash"] = state.journal_hash
+            else:
+                delta["journal_names"] = journal_names
+        return delta
+
+    @staticmethod
+    def _chat_full(
+        payload: dict[str, Any],
+        state: ConversationState | None,
+        journal_names: list[str] | None,
+    ) -> dict[str, Any]:
+        full = dict(payload)
+        if state is not None and state.messages:
+            full["history"] = list(state.messages)
+        if journal_names is not None:
+            full["journal_names"] = journal_names
+        return full
 
     async def async_journals(self) -> dict[str, Any]:
         return await self._request("GET", "/journals")
@@ -97,6 +559,102 @@ class HAAgentApi:
     async def async_get_journal(self, name: str) -> dict[str, Any]:
         return await self._request("GET", "/journal", params={"name": name})
 
+    async def async_get_journals_many(
+        self, names: list[str], *, concurrency: int = JOURNAL_FETCH_CONCURRENCY
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch several journals at once, keyed by name.
+
+        A journal that could not be fetched maps to a
+        ``{"status": "error", "error": ...}`` result instead of failing the
+        whole call.
+        """
+        return {
+            name: result
+            async for name, result in self.async_iter_journals(
+                names, concurrency=concurrency
+            )
+        }
+
+    async def async_iter_journals(
+        self, names: list[str], *, concurrency: int = JOURNAL_FETCH_CONCURRENCY
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Yield ``(name, journal)`` pairs as each journal arrives.
+
+        Journals already being fetched by another caller are awaited rather
+        than requested again.
+        """
+        loop = asyncio.get_running_loop()
+        unique = list(dict.fromkeys(names))
+        owned = {
+            name: loop.create_future()
+            for name in unique
+            if name not in self._journal_inflight
+        }
+        if owned:
+            self._journal_inflight.update(owned)
+            task = loop.create_task(self._async_fetch_journals(owned, concurrency))
+            self._journal_tasks.add(task)
+            task.add_done_callback(self._journal_tasks.discard)
+        by_future = {self._journal_inflight[name]: name for name in unique}
+        remaining = set(by_future)
+        while remaining:
+            done, remaining = await asyncio.wait(
+                remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                yield by_future[future], future.result()
+
+    async def _async_fetch_journals(
+        self,
+        owned: dict[str, asyncio.Future[dict[str, Any]]],
+        concurrency: int,
+    ) -> None:
+        """Resolve ``owned`` from the batch endpoint or, on older cores, one by one."""
+        error = "Journal not returned"
+        loop = asyncio.get_running_loop()
+        missing = self._journal_batch_missing
+        try:
+            if missing is None or loop.time() - missing >= JOURNAL_BATCH_RETRY:
+                try:
+                    data = await self._request(
+                        "POST", "/journals/batch", json_data={"names": list(owned)}
+                    )
+                except HAAgentResponseError as err:
+                    if err.status not in (404, 405):
+                        raise
+                    self._journal_batch_missing = loop.time()
+                else:
+                    self._journal_batch_missing = None
+                    journals = data.get("journals") if isinstance(data, dict) else None
+                    for name, future in owned.items():
+                        result = journals.get(name) if isinstance(journals, dict) else None
+                        if isinstance(result, dict) and not future.done():
+                            future.set_result(result)
+                    return
+
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def _fetch_one(name: str, future: asyncio.Future) -> None:
+                async with semaphore:
+                    try:
+                        result = await self.async_get_journal(name)
+                    except HomeAssistantError as err:
+                        result = {"status": "error", "error": str(err)}
+                if not future.done():
+                    future.set_result(result)
+
+            await asyncio.gather(
+                *(_fetch_one(name, future) for name, future in owned.items())
+            )
+        except HomeAssistantError as err:
+            error = str(err)
+        finally:
+            for name, future in owned.items():
+                if not future.done():
+                    future.set_result({"status": "error", "error": error})
+                if self._journal_inflight.get(name) is future:
+                    del self._journal_inflight[name]
+
     async def async_put_journal(
         self,
         name: str,
@@ -123,12 +681,15 @@ class HAAgentApi:
         *,
         limit: int | None = None,
         offset: int | None = None,
+        since_id: str | None = None,
     ) -> dict[str, Any]:
         params: dict[str, Any] = {"name": name}
         if limit is not None:
             params["limit"] = limit
         if offset is not None:
             params["offset"] = offset
+        if since_id is not None:
+            params["since_id"] = since_id
         return await self._request("GET", "/journal/entries", params=params)
 
     async def async_memory_write(
@@ -144,7 +705,19 @@ class HAAgentApi:
             payload["source"] = source
         if metadata:
             payload["metadata"] = metadata
-        return await self._request("POST", "/memory/write", json_data=payload)
+        data = await self._request(
+            "POST", "/memory/write", json_data=payload, idempotent=False
+        )
+        index = self._memory_index
+        if index is not None:
+            record = data.get("record") if isinstance(data, dict) else None
+            if not isinstance(record, dict) and isinstance(data, dict):
+                record = {**payload, "id": data.get("id")}
+            # Without an id the write cannot be mirrored, so the local copy
+            # of this kind is stale until the next sync.
+            if not isinstance(record, dict) or not index.add(kind, record):
+                index.invalidate(kind)
+        return data
 
     async def async_memory_query(
         self,
@@ -154,12 +727,44 @@ class HAAgentApi:
         limit: int | None = None,
         offset: int | None = None,
     ) -> dict[str, Any]:
+        index = self._memory_index
+        if index is not None:
+            local = index.query(kind, text, limit=limit, offset=offset)
+            if local is not None:
+                return local
+            index.track(kind)
         params: dict[str, Any] = {"kind": kind, "text": text}
         if limit is not None:
             params["limit"] = limit
         if offset is not None:
             params["offset"] = offset
-        return await self._request("GET", "/memory/query", params=params)
+        if index is not None:
+            # Ask for the query vector so repeats can be answered locally.
+            params["embeddings"] = "true"
+        data = await self._request("GET", "/memory/query", params=params)
+        if index is not None:
+            index.learn(text, data)
+        return data
+
+    async def async_memory_records(
+        self,
+        kind: str,
+        *,
+        since_id: str | None = None,
+        offset: int | None = None,
+        limit: int | None = None,
+        embeddings: bool = False,
+    ) -> dict[str, Any]:
+        params: dict[str, Any] = {"kind": kind}
+        if since_id is not None:
+            params["since_id"] = since_id
+        if offset is not None:
+            params["offset"] = offset
+        if limit is not None:
+            params["limit"] = limit
+        if embeddings:
+            params["embeddings"] = "true"
+        return await self._request("GET", "/memory/records", params=params)
 
     async def async_entity_suggest(
         self,
@@ -178,6 +783,156 @@ class HAAgentApi:
             payload["model"] = model
         return await self._request("POST", "/entity/suggest", json_data=payload)
 
+    async def async_stt_stream(
+        self,
+        audio: AsyncIterable[bytes],
+        *,
+        language: str,
+        audio_format: str,
+        codec: str,
+        sample_rate: int,
+        bit_rate: int,
+        channels: int,
+    ) -> dict[str, Any]:
+        """Upload audio to /stt/stream as it is captured and return the transcript.
+
+        The body is sent with chunked transfer encoding, so the core can start
+        transcribing before the utterance ends. A consumed stream cannot be
+        replayed, so like other non-idempotent requests this only fails over
+        when the connection could not be made.
+        """
+        loop = asyncio.get_running_loop()
+        stats = self._stats_for("POST", "/stt/stream")
+        stats.requests += 1
+        start = loop.time()
+        params = {
+            "language": language,
+            "format": audio_format,
+            "codec": codec,
+            "sample_rate": sample_rate,
+            "bit_rate": bit_rate,
+            "channels": channels,
+        }
+        last_err: Exception | None = None
+        for backend in self._ordered_backends():
+            backend.requests += 1
+            try:
+                async with self._session.post(
+                    f"{backend.url}/stt/stream",
+                    params=params,
+                    data=audio,
+                    headers={
+                        **self._headers(),
+                        "Content-Type": "application/octet-stream",
+                    },
+                    timeout=aiohttp.ClientTimeout(
+                        total=None, sock_read=self._timeout.total
+                    ),
+                ) as resp:
+                    data = await self._decode_answer(resp)
+            except HAAgentResponseError as err:
+                backend.mark_answered(loop.time())
+                stats.errors += 1
+                stats.recent_errors.append(f"{backend.url}: {err.data}")
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                backend.mark_failed(str(err) or type(err).__name__, loop.time())
+                last_err = err
+                if isinstance(err, aiohttp.ClientConnectorError):
+                    continue
+                break
+            if resp.status >= 500:
+                backend.mark_failed(f"HTTP {resp.status}", loop.time())
+                last_err = HAAgentResponseError(resp.status, data)
+                break
+            backend.mark_answered(loop.time())
+            stats.latencies.append(loop.time() - start)
+            if resp.status >= 400:
+                stats.errors += 1
+                stats.recent_errors.append(f"{backend.url}: HTTP {resp.status}")
+                raise HAAgentResponseError(resp.status, data)
+            return data
+        self._raise_unanswered(stats, last_err)
+
+    async def async_tts_stream(
+        self,
+        text: str,
+        *,
+        language: str | None = None,
+        voice: str | None = None,
+        audio_format: str = "mp3",
+    ) -> AsyncIterator[bytes]:
+        """Yield synthesized audio from /tts/stream as chunks arrive.
+
+        Backends are tried in routing order until one answers, failing over
+        on transport errors and ``FAILOVER_STATUSES`` as idempotent requests
+        do; endpoint stats record the time to the first audio chunk.
+        """
+        loop = asyncio.get_running_loop()
+        stats = self._stats_for("POST", "/tts/stream")
+        stats.requests += 1
+        start = loop.time()
+        payload: dict[str, Any] = {"text": text, "format": audio_format}
+        if language:
+            payload["language"] = language
+        if voice:
+            payload["voice"] = voice
+        last_err: Exception | None = None
+        for backend in self._ordered_backends():
+            backend.requests += 1
+            try:
+                resp = await self._session.post(
+                    f"{backend.url}/tts/stream",
+                    json=payload,
+                    headers=self._headers(),
+                    timeout=aiohttp.ClientTimeout(
+                        total=None, sock_read=self._timeout.total
+                    ),
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                backend.mark_failed(str(err) or type(err).__name__, loop.time())
+                last_err = err
+                continue
+            if resp.status < 400:
+                backend.mark_answered(loop.time())
+                break
+            try:
+                data = await self._decode_answer(resp)
+            except HAAgentResponseError as err:
+                data = err.data
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                data = f"HTTP {resp.status}"
+            finally:
+                resp.release()
+            if resp.status < 500:
+                backend.mark_answered(loop.time())
+                stats.errors += 1
+                stats.recent_errors.append(f"{backend.url}: HTTP {resp.status}")
+                raise HAAgentResponseError(resp.status, data)
+            backend.mark_failed(f"HTTP {resp.status}", loop.time())
+            last_err = HAAgentResponseError(resp.status, data)
+            if resp.status not in FAILOVER_STATUSES:
+                self._raise_unanswered(stats, last_err)
+        else:
+            self._raise_unanswered(stats, last_err)
+
+        try:
+            first = True
+            async for chunk in resp.content.iter_chunked(AUDIO_CHUNK_SIZE):
+                if first:
+                    stats.latencies.append(loop.time() - start)
+                    first = False
+                yield chunk
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            backend.mark_failed(str(err) or type(err).__name__, loop.time())
+            stats.errors += 1
+            stats.recent_errors.append(f"{type(err).__name__}: {err}")
+            raise HomeAssistantError(
+                "Error communicating with Home Assistant Agent"
+            ) from err
+        finally:
+            resp.release()
+
     async def async_health(self) -> dict[str, Any]:
         return await self._request("GET", "/health")
 
@@ -7,7 +7,14 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 
-from .const import CONF_BASE_URL, CONF_SET_DEFAULT_AGENT, DEFAULT_BASE_URL, DOMAIN
+from .const import (
+    CONF_BASE_URL,
+    CONF_JOURNAL_MIRROR,
+    CONF_MEMORY_MIRROR,
+    CONF_SET_DEFAULT_AGENT,
+    DEFAULT_BASE_URL,
+    DOMAIN,
+)
 
 
 class HAAgentConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -48,6 +55,18 @@ class HAAgentOptionsFlow(config_entries.OptionsFlow):
                             CONF_SET_DEFAULT_AGENT, False
                         ),
                     ): bool,
+                    vol.Optional(
+                        CONF_JOURNAL_MIRROR,
+                        default=self._config_entry.options.get(
+                            CONF_JOURNAL_MIRROR, False
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MEMORY_MIRROR,
+                        default=self._config_entry.options.get(
+                            CONF_MEMORY_MIRROR, False
+                        ),
+                    ): bool,
                 }
             )
             return self.async_show_form(step_id="init", data_schema=data_schema)
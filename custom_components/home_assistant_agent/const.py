@@ -3,6 +3,7 @@
 DOMAIN = "home_assistant_agent"
 
 CONF_BASE_URL = "base_url"
+CONF_BASE_URLS = "base_urls"
 CONF_LLM_KEY = "llm_key"
 CONF_AUTH_KEY = "auth_key"
 CONF_SET_DEFAULT_AGENT = "set_default_agent"
@@ -14,8 +15,30 @@ CONF_MODEL_FAST = "model_fast"
 CONF_TTS_MODEL = "tts_model"
 CONF_STT_MODEL = "stt_model"
 CONF_INSTRUCTION = "instruction"
+CONF_JOURNAL_MIRROR = "journal_mirror"
+CONF_MEMORY_MIRROR = "memory_mirror"
 
 DEFAULT_BASE_URL = "http://core-ha_agent_core"
+BACKEND_PROBE_INTERVAL = 30
+JOURNAL_SYNC_INTERVAL = 60
+MEMORY_SYNC_INTERVAL = 60
+
+SERVICE_SEARCH_JOURNALS = "search_journals"
+SERVICE_MEMORY_QUERY = "memory_query"
+SERVICE_MEMORY_WRITE = "memory_write"
+SIGNAL_ADDON_CONFIG_UPDATED = f"{DOMAIN}_addon_config_updated"
+
+# Request budgets, in seconds.
+CONVERSATION_DEADLINE = 20.0
+# Share of a conversation turn's budget the add-on config lookup may use; the
+# lookup is optional, so it must never starve the chat request.
+ADDON_CONFIG_DEADLINE_SHARE = 0.25
+ADDON_CONFIG_TIMEOUT = 15.0
+ADDON_CONFIG_UPDATE_TIMEOUT = 20.0
+HEALTH_CHECK_TIMEOUT = 10.0
+
+DEFAULT_TIMEOUT_REPLY = "Sorry, that took too long. Please try again."
+DEFAULT_ERROR_REPLY = "Sorry, I couldn't reach the agent."
 
 DEFAULT_INSTRUCTION = (
     "You are Home Assistant Agent, a helpful assistant embedded in Home Assistant. "
@@ -24,6 +47,42 @@ DEFAULT_INSTRUCTION = (
     "If an action could be destructive or unsafe, ask for confirmation first."
 )
 
+# Languages offered by the STT/TTS entities; the core's models are multilingual
+# and the assist pipeline needs explicit codes to match against.
+SPEECH_LANGUAGES = [
+    "ar",
+    "cs",
+    "da",
+    "de",
+    "el",
+    "en",
+    "es",
+    "fi",
+    "fr",
+    "he",
+    "hi",
+    "hu",
+    "id",
+    "it",
+    "ja",
+    "ko",
+    "nb",
+    "nl",
+    "pl",
+    "pt",
+    "ro",
+    "ru",
+    "sk",
+    "sv",
+    "th",
+    "tr",
+    "uk",
+    "vi",
+    "zh",
+]
+DEFAULT_SPEECH_LANGUAGE = "en"
+TTS_AUDIO_FORMAT = "mp3"
+
 PANEL_FRONTEND_URL = "home-assistant-agent"
 PANEL_TITLE = "Home Assistant Agent"
 PANEL_ICON = "mdi:robot"
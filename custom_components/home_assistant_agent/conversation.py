@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import logging
 from typing import Any
 
 from homeassistant.components import conversation
@@ -14,52 +14,19 @@ from homeassistant.components.conversation import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.intent import IntentResponse
 
-from .const import DEFAULT_BASE_URL, DOMAIN
-
-
-@dataclass
-class AddonConfig:
-    model_reasoning: str | None = None
-    model_fast: str | None = None
-
-
-async def _fetch_addon_config(hass: HomeAssistant, entry_id: str) -> AddonConfig | None:
-    entry_data = hass.data.get(DOMAIN, {}).get("entries", {}).get(entry_id, {})
-    if not entry_data:
-        return None
-    now = asyncio.get_running_loop().time()
-    cached = entry_data.get("addon_config")
-    cached_ts = float(entry_data.get("addon_config_ts") or 0.0)
-    if cached and (now - cached_ts) < 15:
-        return cached
-
-    base_url = entry_data.get("settings", {}).get("base_url", DEFAULT_BASE_URL)
-    session = aiohttp_client.async_get_clientsession(hass)
-    url = f"{base_url.rstrip('/')}/config"
-    try:
-        async with session.get(url, timeout=15) as resp:
-            payload = await resp.json()
-    except Exception:  # noqa: BLE001
-        entry_data["addon_config_ts"] = now
-        entry_data["addon_config"] = None
-        return None
-
-    config = payload.get("config") if isinstance(payload, dict) else None
-    if not isinstance(config, dict):
-        entry_data["addon_config_ts"] = now
-        entry_data["addon_config"] = None
-        return None
-
-    parsed = AddonConfig(
-        model_reasoning=config.get("model_reasoning"),
-        model_fast=config.get("model_fast"),
-    )
-    entry_data["addon_config"] = parsed
-    entry_data["addon_config_ts"] = now
-    return parsed
+from .addon_config import async_get_addon_config
+from .api import Deadline, DeadlineExceeded
+from .const import (
+    CONVERSATION_DEADLINE,
+    DEFAULT_ERROR_REPLY,
+    DEFAULT_TIMEOUT_REPLY,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class HAAgentConversationAgent(AbstractConversationAgent):
@@ -94,22 +61,37 @@ class HAAgentConversationAgent(AbstractConversationAgent):
             .get(self._entry_id, {})
         )
         client = entry_data.get("client")
-        addon_cfg = await _fetch_addon_config(self.hass, self._entry_id)
+        # One budget covers the whole turn: config lookup and chat share it.
+        deadline = Deadline(CONVERSATION_DEADLINE)
+        addon_cfg = await async_get_addon_config(
+            self.hass, self._entry_id, deadline=deadline
+        )
         model = addon_cfg.model_reasoning if addon_cfg else None
         if not model and addon_cfg:
             model = addon_cfg.model_fast
 
-        response_text = "Sorry, I couldn't reach the agent."
+        response_text = DEFAULT_ERROR_REPLY
         conversation_id = conversation_input.conversation_id
         if client:
-            result: dict[str, Any] = await client.async_chat(
-                conversation_input.text,
-                conversation_id=conversation_id,
-                use_llm=True,
-                model=model,
-            )
-            response_text = result.get("response", response_text)
-            conversation_id = result.get("conversation_id", conversation_id)
+            try:
+                result: dict[str, Any] = await client.async_chat(
+                    conversation_input.text,
+                    conversation_id=conversation_id,
+                    use_llm=True,
+                    model=model,
+                    deadline=deadline,
+                )
+            except DeadlineExceeded:
+                _LOGGER.warning(
+                    "Conversation turn exceeded its %ss deadline",
+                    CONVERSATION_DEADLINE,
+                )
+                response_text = DEFAULT_TIMEOUT_REPLY
+            except HomeAssistantError as err:
+                _LOGGER.warning("Conversation request failed: %s", err)
+            else:
+                response_text = result.get("response", response_text)
+                conversation_id = result.get("conversation_id", conversation_id)
 
         intent_response = IntentResponse(language=conversation_input.language)
         intent_response.async_set_speech(response_text)
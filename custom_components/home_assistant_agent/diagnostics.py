@@ -0,0 +1,100 @@
+"""Diagnostics support for Home Assistant Agent."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import aiohttp_client
+
+from .const import (
+    CONF_ANTHROPIC_KEY,
+    CONF_AUTH_KEY,
+    CONF_GEMINI_KEY,
+    CONF_LLM_KEY,
+    CONF_OPENAI_KEY,
+    DOMAIN,
+)
+
+TO_REDACT = {
+    CONF_AUTH_KEY,
+    CONF_LLM_KEY,
+    CONF_OPENAI_KEY,
+    CONF_ANTHROPIC_KEY,
+    CONF_GEMINI_KEY,
+    "api_key",
+    "api_keys",
+    "openai_api_key",
+    "anthropic_api_key",
+    "google_api_key",
+}
+
+
+def _connection_pool(hass: HomeAssistant) -> dict[str, Any] | None:
+    """Report the shared aiohttp connector's public limits.
+
+    In-use and idle counts are only kept in private connector fields, so
+    they are not reported; the soak harness measures them with trace hooks.
+    """
+    connector = aiohttp_client.async_get_clientsession(hass).connector
+    if connector is None:
+        return None
+    return {"limit": connector.limit, "limit_per_host": connector.limit_per_host}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return settings and a performance snapshot for a config entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    entry_data = domain_data.get("entries", {}).get(entry.entry_id, {})
+    client = entry_data.get("client")
+
+    addon_config = entry_data.get("addon_config")
+    addon_config_ts = float(entry_data.get("addon_config_ts") or 0.0)
+    addon_config_age = (
+        round(asyncio.get_running_loop().time() - addon_config_ts, 1)
+        if addon_config_ts
+        else None
+    )
+
+    suggestions = domain_data.get("suggestions")
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "settings": async_redact_data(entry_data.get("settings", {}), TO_REDACT),
+        "addon_config": {
+            "age_seconds": addon_config_age,
+            "config": async_redact_data(asdict(addon_config), TO_REDACT)
+            if addon_config
+            else None,
+        },
+        "connection_pool": _connection_pool(hass),
+        "caches": {
+            name: stats.as_dict()
+            for name, stats in domain_data.get("cache_stats", {}).items()
+        },
+        "backends": client.backend_stats() if client else [],
+        "endpoints": client.endpoint_stats() if client else {},
+        "cached_conversations": client.cached_conversations if client else 0,
+        "entity_payload": {
+            "registry_version": domain_data.get("registry_version"),
+            "last_build": domain_data.get("entity_payload_timing"),
+        },
+        "suggestion_refresh": suggestions.progress if suggestions else None,
+        "journal_mirror": domain_data["journal_index"].last_sync
+        if domain_data.get("journal_index")
+        else None,
+        "memory_mirror": client.memory_index.stats()
+        if client and client.memory_index
+        else None,
+        "event_loop": domain_data["loop_monitor"].snapshot()
+        if domain_data.get("loop_monitor")
+        else None,
+    }
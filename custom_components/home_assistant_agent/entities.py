@@ -0,0 +1,82 @@
+"""Compact in-memory representation of the registry entity payload."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import sys
+from typing import Any
+
+ENTITY_FIELDS = ("entity_id", "name", "device_class", "unit", "area", "device")
+
+
+def _intern(value: str | None) -> str | None:
+    # sys.intern only takes exact str, not StrEnum members.
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
+class EntityRecord:
+    """One entity of the payload.
+
+    Slots keep each record far smaller than a dict with the same keys, and
+    area, device, device class and unit strings are interned so the many
+    entities sharing them hold one copy. Responses are encoded from
+    ``as_dict`` one slice at a time: orjson encodes dataclasses several times
+    slower than dicts, and short-lived dicts per slice cost little memory.
+    """
+
+    entity_id: str
+    name: str
+    device_class: str | None
+    unit: str | None
+    area: str | None
+    device: str | None
+
+    @classmethod
+    def create(
+        cls,
+        entity_id: str,
+        name: str,
+        device_class: str | None,
+        unit: str | None,
+        area: str | None,
+        device: str | None,
+    ) -> EntityRecord:
+        return cls(
+            entity_id,
+            name,
+            _intern(device_class),
+            _intern(unit),
+            _intern(area),
+            _intern(device),
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read a field like ``dict.get`` so code can take records or dicts."""
+        return getattr(self, key, default)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "entity_id": self.entity_id,
+            "name": self.name,
+            "device_class": self.device_class,
+            "unit": self.unit,
+            "area": self.area,
+            "device": self.device,
+        }
+
+    def project(self, fields: Iterable[str]) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in fields}
+
+
+def entity_dict(entity: Entity) -> dict[str, Any]:
+    """Return ``entity`` as a plain dict, for encoders that need one."""
+    if isinstance(entity, EntityRecord):
+        return entity.as_dict()
+    return entity
+
+
+# Entities arrive as records from the registry payload or as dicts posted by
+# the panel.
+Entity = EntityRecord | dict[str, Any]
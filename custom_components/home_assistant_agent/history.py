@@ -0,0 +1,83 @@
+"""Integration-side cache of recent conversations for delta-only chat turns."""
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+import hashlib
+import json
+from typing import Any
+
+MAX_CONVERSATIONS = 128
+MAX_HISTORY_MESSAGES = 40
+
+
+def journal_names_key(journal_names: list[str] | None) -> str | None:
+    """Return a stable key for the journal names a turn asked for."""
+    if journal_names is None:
+        return None
+    encoded = json.dumps(sorted(journal_names), separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ConversationState:
+    """What the integration knows about one conversation held by the core.
+
+    ``version`` is the core's history version after the last turn. The
+    ``journal_hash`` is the core's content hash of the journal context, valid
+    while the requested names still hash to ``journal_key``.
+    """
+
+    version: int | None = None
+    messages: deque[dict[str, str]] = field(
+        default_factory=lambda: deque(maxlen=MAX_HISTORY_MESSAGES)
+    )
+    journal_key: str | None = None
+    journal_hash: str | None = None
+
+
+class ConversationHistoryCache:
+    """A bounded LRU of recent conversations keyed by conversation_id."""
+
+    def __init__(self, max_conversations: int = MAX_CONVERSATIONS) -> None:
+        self._max = max_conversations
+        self._conversations: OrderedDict[str, ConversationState] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._conversations)
+
+    def get(self, conversation_id: str | None) -> ConversationState | None:
+        if not conversation_id:
+            return None
+        state = self._conversations.get(conversation_id)
+        if state is not None:
+            self._conversations.move_to_end(conversation_id)
+        return state
+
+    def record_turn(
+        self,
+        conversation_id: str,
+        text: str,
+        response: str | None,
+        *,
+        previous: ConversationState | None,
+        version: Any,
+        journal_key: str | None,
+        journal_hash: Any,
+    ) -> None:
+        state = previous or ConversationState()
+        state.messages.append({"role": "user", "content": text})
+        if response:
+            state.messages.append({"role": "assistant", "content": response})
+        state.version = version if isinstance(version, int) else None
+        state.journal_key = journal_key
+        state.journal_hash = journal_hash if isinstance(journal_hash, str) else None
+        self._conversations[conversation_id] = state
+        self._conversations.move_to_end(conversation_id)
+        while len(self._conversations) > self._max:
+            self._conversations.popitem(last=False)
+
+    def discard(self, conversation_id: str | None) -> None:
+        if conversation_id:
+            self._conversations.pop(conversation_id, None)
@@ -0,0 +1,404 @@
+"""Local SQLite FTS5 mirror of ha_agent_core journals."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .api import HAAgentApi
+
+_LOGGER = logging.getLogger(__name__)
+
+JOURNAL_INDEX_FILENAME = "home_assistant_agent_journals.db"
+SYNC_PAGE_SIZE = 200
+# Seconds between full resyncs of a journal, which catch entries the core
+# removed or replaced without changing the entry count.
+FULL_RESYNC_INTERVAL = 3600.0
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal_state (
+    journal TEXT PRIMARY KEY,
+    last_entry_id TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    rowid INTEGER PRIMARY KEY,
+    journal TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT,
+    UNIQUE (journal, entry_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    content, content='entries', content_rowid='rowid', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, content) VALUES (new.rowid, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, content)
+    VALUES ('delete', old.rowid, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, content)
+    VALUES ('delete', old.rowid, old.content);
+    INSERT INTO entries_fts(rowid, content) VALUES (new.rowid, new.content);
+END;
+"""
+
+
+def _match_expression(query: str) -> str:
+    """Quote each term so user input can never be parsed as FTS5 syntax."""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms if term)
+
+
+def _entry_id(entry: dict[str, Any]) -> str | None:
+    value = entry.get("id", entry.get("entry_id"))
+    return None if value is None else str(value)
+
+
+def _listed_count(item: Any) -> int | None:
+    """Return the entry count a journal listing item reports, if any."""
+    if not isinstance(item, dict):
+        return None
+    for key in ("entry_count", "entries", "count"):
+        value = item.get(key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def _entry_rows(
+    journal: str, entries: list[dict[str, Any]]
+) -> list[tuple[str, str, str, Any]]:
+    rows = []
+    for entry in entries:
+        entry_id = _entry_id(entry)
+        content = entry.get("content")
+        if entry_id is None or not isinstance(content, str):
+            continue
+        rows.append((journal, entry_id, content, entry.get("created_at")))
+    return rows
+
+
+class JournalIndex:
+    """Mirror journal entries into an on-disk full-text index.
+
+    All SQLite work runs in the executor behind one lock. Sync pulls only
+    entries after the last seen entry id per journal, paging by offset on
+    cores that ignore ``since_id``. A journal is resynced in full when its
+    entry count differs from the core's, or every ``FULL_RESYNC_INTERVAL``,
+    so removed and replaced entries leave the mirror. Search never needs
+    the add-on, so it keeps working while the add-on restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._path = hass.config.path(JOURNAL_INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._last_sync: dict[str, Any] = {}
+        self._sync_lock = asyncio.Lock()
+        self._sync_task: asyncio.Task | None = None
+        self._closed = False
+        # Monotonic time of the last full resync per journal.
+        self._full_synced: dict[str, float] = {}
+
+    @property
+    def last_sync(self) -> dict[str, Any]:
+        return dict(self._last_sync)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._closed:
+            raise HomeAssistantError("Journal index is closed")
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def async_close(self) -> None:
+        """Stop a running sync, then close the database for good."""
+        self._closed = True
+        task = self._sync_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            await asyncio.wait((task,))
+        await self._hass.async_add_executor_job(self._close)
+
+    def _last_entry_ids(self) -> dict[str, str | None]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT journal, last_entry_id FROM journal_state"
+            )
+            return dict(rows.fetchall())
+
+    def _entry_count(self, journal: str) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COUNT(*) FROM entries WHERE journal = ?", (journal,)
+            ).fetchone()
+            return row[0]
+
+    def _store_entries(
+        self, journal: str, entries: list[dict[str, Any]], last_entry_id: str | None
+    ) -> int:
+        rows = _entry_rows(journal, entries)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                inserted = conn.executemany(
+                    "INSERT OR IGNORE INTO entries (journal, entry_id, content, created_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    rows,
+                ).rowcount
+                conn.execute(
+                    "INSERT INTO journal_state (journal, last_entry_id, synced_at)"
+                    " VALUES (?, ?, ?) ON CONFLICT(journal) DO UPDATE SET"
+                    " last_entry_id = excluded.last_entry_id,"
+                    " synced_at = excluded.synced_at",
+                    (journal, last_entry_id, time.time()),
+                )
+        return inserted
+
+    def _replace_entries(
+        self, journal: str, entries: list[dict[str, Any]], last_entry_id: str | None
+    ) -> tuple[int, int]:
+        """Make the journal hold exactly ``entries``; return (added, removed)."""
+        rows = _entry_rows(journal, entries)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                held = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT entry_id FROM entries WHERE journal = ?", (journal,)
+                    )
+                }
+                gone = held - {row[1] for row in rows}
+                removed = conn.executemany(
+                    "DELETE FROM entries WHERE journal = ? AND entry_id = ?",
+                    [(journal, entry_id) for entry_id in gone],
+                ).rowcount
+                conn.executemany(
+                    "INSERT INTO entries (journal, entry_id, content, created_at)"
+                    " VALUES (?, ?, ?, ?) ON CONFLICT(journal, entry_id) DO UPDATE"
+                    " SET content = excluded.content,"
+                    " created_at = excluded.created_at"
+                    " WHERE content IS NOT excluded.content",
+                    rows,
+                )
+                conn.execute(
+                    "INSERT INTO journal_state (journal, last_entry_id, synced_at)"
+                    " VALUES (?, ?, ?) ON CONFLICT(journal) DO UPDATE SET"
+                    " last_entry_id = excluded.last_entry_id,"
+                    " synced_at = excluded.synced_at",
+                    (journal, last_entry_id, time.time()),
+                )
+        added = len({row[1] for row in rows} - held)
+        return added, removed
+
+    def _search(
+        self, query: str, journal: str | None, limit: int
+    ) -> list[dict[str, Any]]:
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        sql = (
+            "SELECT e.journal, e.entry_id, e.created_at,"
+            " snippet(entries_fts, 0, '[', ']', '…', 16) AS snippet,"
+            " bm25(entries_fts) AS rank"
+            " FROM entries_fts JOIN entries e ON e.rowid = entries_fts.rowid"
+            " WHERE entries_fts MATCH ?"
+        )
+        params: list[Any] = [expression]
+        if journal:
+            sql += " AND e.journal = ?"
+            params.append(journal)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        return [
+            {
+                "journal": row[0],
+                "entry_id": row[1],
+                "created_at": row[2],
+                "snippet": row[3],
+                "score": round(-row[4], 4),
+            }
+            for row in rows
+        ]
+
+    async def async_search(
+        self, query: str, *, journal: str | None = None, limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> list[dict[str, Any]]:
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        return await self._hass.async_add_executor_job(
+            self._search, query, journal, limit
+        )
+
+    async def async_sync(self, client: HAAgentApi) -> int:
+        """Pull new entries for every journal; return how many were added."""
+        if self._closed or self._sync_lock.locked():
+            return 0
+        async with self._sync_lock:
+            self._sync_task = asyncio.current_task()
+            try:
+                return await self._async_sync(client)
+            finally:
+                self._sync_task = None
+
+    async def _async_sync(self, client: HAAgentApi) -> int:
+        try:
+            listing = await client.async_journals()
+        except HomeAssistantError as err:
+            _LOGGER.debug("Journal mirror sync skipped: %s", err)
+            self._last_sync = {"status": "error", "error": str(err)}
+            return 0
+        journals = listing.get("journals") if isinstance(listing, dict) else None
+        items = [
+            (item.get("name") if isinstance(item, dict) else item, _listed_count(item))
+            for item in journals or []
+        ]
+        names = [name for name, _count in items]
+        last_ids = await self._hass.async_add_executor_job(self._last_entry_ids)
+        added = removed = 0
+        for name, count in items:
+            if not isinstance(name, str):
+                continue
+            try:
+                resync = None
+                if self._resync_due(name):
+                    resync = await self._async_resync_journal(client, name)
+                if resync is None:
+                    added += await self._async_sync_journal(
+                        client, name, last_ids.get(name)
+                    )
+                    if count is not None:
+                        held = await self._hass.async_add_executor_job(
+                            self._entry_count, name
+                        )
+                        if held != count:
+                            resync = await self._async_resync_journal(client, name)
+                if resync is not None:
+                    added += resync[0]
+                    removed += resync[1]
+            except HomeAssistantError as err:
+                _LOGGER.debug("Journal mirror sync of %s failed: %s", name, err)
+                self._last_sync = {"status": "error", "error": str(err)}
+                return added
+        self._last_sync = {
+            "status": "ok",
+            "added": added,
+            "removed": removed,
+            "journals": len(names),
+        }
+        return added
+
+    def _resync_due(self, name: str) -> bool:
+        synced = self._full_synced.get(name)
+        return synced is None or time.monotonic() - synced >= FULL_RESYNC_INTERVAL
+
+    async def _async_resync_journal(
+        self, client: HAAgentApi, name: str
+    ) -> tuple[int, int] | None:
+        """Fetch every entry of a journal and replace the mirrored ones.
+
+        Returns (added, removed). Pages by ``since_id`` and falls back to
+        offset like the incremental sync; if the core repeats pages under
+        both, returns None without removing anything, as the fetched list
+        may be partial.
+        """
+        entries: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        since_id: str | None = None
+        offset: int | None = None
+        while True:
+            if offset is None:
+                page = await client.async_get_journal_entries(
+                    name, limit=SYNC_PAGE_SIZE, since_id=since_id
+                )
+            else:
+                page = await client.async_get_journal_entries(
+                    name, limit=SYNC_PAGE_SIZE, offset=offset
+                )
+            batch = page.get("entries") if isinstance(page, dict) else None
+            batch = [entry for entry in batch or [] if isinstance(entry, dict)]
+            fresh = [entry for entry in batch if _entry_id(entry) not in seen]
+            if batch and not fresh:
+                if offset is not None:
+                    _LOGGER.debug("Journal %s could not be paged for a resync", name)
+                    self._full_synced[name] = time.monotonic()
+                    return None
+                offset = len(seen)
+                continue
+            entries.extend(fresh)
+            seen.update(_entry_id(entry) for entry in fresh)
+            if len(batch) < SYNC_PAGE_SIZE:
+                break
+            if offset is None:
+                since_id = _entry_id(batch[-1])
+            else:
+                offset += len(batch)
+        last_entry_id = _entry_id(entries[-1]) if entries else None
+        result = await self._hass.async_add_executor_job(
+            self._replace_entries, name, entries, last_entry_id
+        )
+        self._full_synced[name] = time.monotonic()
+        return result
+
+    async def _async_sync_journal(
+        self, client: HAAgentApi, name: str, last_entry_id: str | None
+    ) -> int:
+        added = 0
+        offset: int | None = None
+        while True:
+            if offset is None:
+                page = await client.async_get_journal_entries(
+                    name, limit=SYNC_PAGE_SIZE, since_id=last_entry_id
+                )
+            else:
+                page = await client.async_get_journal_entries(
+                    name, limit=SYNC_PAGE_SIZE, offset=offset
+                )
+            entries = page.get("entries") if isinstance(page, dict) else None
+            entries = [entry for entry in entries or [] if isinstance(entry, dict)]
+            if not entries:
+                return added
+            page_last = _entry_id(entries[-1]) or last_entry_id
+            inserted = await self._hass.async_add_executor_job(
+                self._store_entries, name, entries, page_last
+            )
+            added += inserted
+            last_entry_id = page_last
+            if len(entries) < SYNC_PAGE_SIZE:
+                return added
+            if offset is not None:
+                # A full page of nothing new means the core ignores offset
+                # too; stop rather than loop on the same page.
+                if not inserted:
+                    return added
+                offset += len(entries)
+            elif not inserted:
+                # The core ignored since_id and sent entries we already hold;
+                # page by offset from the number of entries mirrored instead.
+                offset = await self._hass.async_add_executor_job(
+                    self._entry_count, name
+                )
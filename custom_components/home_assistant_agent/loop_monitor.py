@@ -0,0 +1,111 @@
+"""Event loop lag sampling and on-loop time accounting for this integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import time
+from typing import Any
+
+SAMPLE_INTERVAL = 0.5
+MAX_SAMPLES = 1024
+# Sliced work records many short sections per sample window.
+RECENT_SECTIONS = 1024
+
+
+def _summary(samples: deque[float]) -> dict[str, Any]:
+    if not samples:
+        return {"samples": 0, "max_ms": None, "p99_ms": None}
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return {
+        "samples": len(ordered),
+        "max_ms": round(ordered[-1] * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+    }
+
+
+class LoopLagMonitor:
+    """Measure event loop stalls and how much of them this integration caused.
+
+    A timer re-arms itself every ``interval`` seconds; the amount it fires
+    late is the loop lag for that window. Heavy integration code runs inside
+    ``track(section)``, which records its own on-loop duration. The part of
+    a lag sample attributed to the integration is the on-loop time of tracked
+    sections in the same window, up to the lag itself.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, interval: float = SAMPLE_INTERVAL
+    ) -> None:
+        self._loop = loop
+        self._interval = interval
+        self._handle: asyncio.TimerHandle | None = None
+        self._lag: deque[float] = deque(maxlen=MAX_SAMPLES)
+        self._attributed: deque[float] = deque(maxlen=MAX_SAMPLES)
+        self._sections: dict[str, deque[float]] = {}
+        # (end, duration) of the sections since the last sample.
+        self._recent: deque[tuple[float, float]] = deque(maxlen=RECENT_SECTIONS)
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    def start(self) -> Callable[[], None]:
+        if self._handle is None:
+            self._schedule()
+        return self.stop
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self) -> None:
+        expected = self._loop.time() + self._interval
+        self._handle = self._loop.call_at(expected, self._sample, expected)
+
+    def _sample(self, expected: float) -> None:
+        now = self._loop.time()
+        lag = max(0.0, now - expected)
+        self._lag.append(lag)
+        window_start = expected - self._interval
+        # Only the part of a section inside the window can have delayed it.
+        busy = sum(
+            min(duration, end - window_start)
+            for end, duration in self._recent
+            if end > window_start
+        )
+        if busy > 0:
+            self._attributed.append(min(lag, busy))
+        self._recent.clear()
+        self._schedule()
+
+    @contextmanager
+    def track(self, section: str) -> Iterator[None]:
+        """Record the time spent on the loop by the enclosed code."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(section, time.perf_counter() - start)
+
+    def record(self, section: str, duration: float) -> None:
+        samples = self._sections.get(section)
+        if samples is None:
+            samples = self._sections[section] = deque(maxlen=MAX_SAMPLES)
+        samples.append(duration)
+        self._recent.append((self._loop.time(), duration))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_s": self._interval,
+            "loop_lag": _summary(self._lag),
+            "attributed_lag": _summary(self._attributed),
+            "sections": {
+                name: _summary(samples) for name, samples in self._sections.items()
+            },
+        }
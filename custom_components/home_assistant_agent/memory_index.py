@@ -0,0 +1,451 @@
+"""Local embedding index mirroring ha_agent_core memory records per kind."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Collection
+from dataclasses import dataclass, field
+import hashlib
+import logging
+import re
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; without it queries stay remote.
+    np = None
+
+if TYPE_CHECKING:
+    from .api import HAAgentApi
+
+_LOGGER = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 256
+# Local answers are only used this long after the last complete sync.
+MEMORY_FRESHNESS = 120.0
+SYNC_PAGE_SIZE = 500
+INITIAL_CAPACITY = 64
+# Query vectors returned by the core, kept per query text.
+MAX_QUERY_VECTORS = 256
+_TOKEN = re.compile(r"\w+")
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def hashed_embedding(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Embed text deterministically by signed hashing of words and word pairs.
+
+    Not a semantic model: pass it as ``MemoryIndex(embed=...)`` in tests, where
+    the same text must give the same vector on every run without a core.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    tokens = _TOKEN.findall(text.lower())
+    features = tokens + [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+    for feature in features:
+        value = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        vector[value % dim] += 1.0 if value >> 63 else -1.0
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def _record_id(record: dict[str, Any]) -> str | None:
+    value = record.get("id", record.get("memory_id"))
+    return None if value is None else str(value)
+
+
+def _unit_vector(value: Any) -> Any:
+    """Return ``value`` as a float32 unit vector, or None if it is not one."""
+    if not isinstance(value, list) or not value:
+        return None
+    try:
+        vector = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    if vector.ndim != 1:
+        return None
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+class _PagingStalled(Exception):
+    """The core repeated a page under both since_id and offset paging."""
+
+
+@dataclass
+class _KindIndex:
+    """Records of one kind and their unit vectors, one row per record."""
+
+    dim: int | None = None
+    ids: list[str] = field(default_factory=list)
+    records: list[dict[str, Any]] = field(default_factory=list)
+    rows: dict[str, int] = field(default_factory=dict)
+    matrix: Any = None
+    synced_at: float | None = None
+    last_id: str | None = None
+    # Whether the core reports deleted ids, so incremental syncs are complete.
+    tombstones: bool = False
+    # Cleared when a record could not be indexed; the next sync is full.
+    complete: bool = True
+
+    def upsert(self, record_id: str, record: dict[str, Any], vector: Any) -> bool:
+        if self.dim is None:
+            self.dim = vector.shape[0]
+        elif vector.shape[0] != self.dim:
+            return False
+        if "embedding" in record:
+            # The vector lives in the matrix; a list of floats is far larger.
+            record = {key: value for key, value in record.items() if key != "embedding"}
+        row = self.rows.get(record_id)
+        if row is None:
+            row = len(self.ids)
+            if self.matrix is None:
+                self.matrix = np.zeros((INITIAL_CAPACITY, self.dim), dtype=np.float32)
+            elif row >= self.matrix.shape[0]:
+                grown = np.zeros((self.matrix.shape[0] * 2, self.dim), dtype=np.float32)
+                grown[:row] = self.matrix[:row]
+                self.matrix = grown
+            self.ids.append(record_id)
+            self.records.append(record)
+            self.rows[record_id] = row
+        else:
+            self.records[row] = record
+        self.matrix[row] = vector
+        return True
+
+    def remove(self, record_id: str) -> None:
+        """Drop a record by moving the last row into its place."""
+        row = self.rows.pop(record_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.records[row] = self.records[last]
+            self.matrix[row] = self.matrix[last]
+            self.rows[moved] = row
+        self.ids.pop()
+        self.records.pop()
+
+    def search(self, vector: Any, count: int) -> list[tuple[dict[str, Any], float]]:
+        size = len(self.ids)
+        if not size or count <= 0 or vector.shape[0] != self.dim:
+            return []
+        scores = self.matrix[:size] @ vector
+        count = min(count, size)
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.records[i], float(scores[i])) for i in top]
+
+
+class MemoryIndex:
+    """Answer memory queries locally while the mirror of a kind is fresh.
+
+    A kind is mirrored once it has been queried. Records are indexed with the
+    embeddings the core returns from ``/memory/records``, and query vectors
+    are taken from the core's ``/memory/query`` answers, so local scores come
+    from the core's own model; repeated queries are then answered locally.
+    An ``embed`` function replaces both, e.g. ``hashed_embedding`` in tests.
+
+    Local answers copy the layout of the last remote answer and are only
+    given after one has been seen. A kind counts as fresh for ``freshness``
+    seconds after a sync that would have seen edits and deletions: cores that
+    report deleted ids are synced incrementally, others are also reconciled
+    against a listing without embeddings, and an edit triggers a full resync.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Any] | None = None,
+        *,
+        freshness: float = MEMORY_FRESHNESS,
+    ) -> None:
+        self._embed = embed
+        self._freshness = freshness
+        self._kinds: dict[str, _KindIndex] = {}
+        # Indexes being rebuilt by a full resync, which also get local writes.
+        self._rebuilding: dict[str, _KindIndex] = {}
+        self._query_vectors: OrderedDict[str, Any] = OrderedDict()
+        # Layout of remote answers: the key holding the result list, whether
+        # results carry a score, and the response status.
+        self._layout: tuple[str, bool, Any] | None = None
+        self._sync_supported: bool | None = None
+        # Set once the core is seen ignoring since_id.
+        self._offset_paging = False
+        self._sync_lock = asyncio.Lock()
+
+    def _kind(self, kind: str) -> _KindIndex:
+        index = self._kinds.get(kind)
+        if index is None:
+            index = self._kinds[kind] = _KindIndex()
+        return index
+
+    def track(self, kind: str) -> None:
+        self._kind(kind)
+
+    def fresh(self, kind: str) -> bool:
+        index = self._kinds.get(kind)
+        if index is None or index.synced_at is None:
+            return False
+        loop = asyncio.get_running_loop()
+        return loop.time() - index.synced_at <= self._freshness
+
+    def invalidate(self, kind: str) -> None:
+        if kind in self._kinds:
+            self._kinds[kind].synced_at = None
+
+    def _vector(self, text: str) -> Any:
+        if self._embed is not None:
+            return self._embed(text)
+        vector = self._query_vectors.get(text)
+        if vector is not None:
+            self._query_vectors.move_to_end(text)
+        return vector
+
+    def _record_vector(self, record: dict[str, Any]) -> Any:
+        vector = _unit_vector(record.get("embedding"))
+        if vector is None and self._embed is not None:
+            vector = self._embed(record["content"])
+        return vector
+
+    def learn(self, text: str, data: Any) -> None:
+        """Remember the layout and query vector of a remote query answer."""
+        if not isinstance(data, dict):
+            return
+        for key, value in data.items():
+            if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+                if value:
+                    scored = "score" in value[0]
+                elif self._layout is not None and self._layout[0] == key:
+                    scored = self._layout[1]
+                else:
+                    scored = False
+                self._layout = (key, scored, data.get("status"))
+                break
+        vector = _unit_vector(data.get("query_embedding"))
+        if vector is not None:
+            self._query_vectors[text] = vector
+            self._query_vectors.move_to_end(text)
+            while len(self._query_vectors) > MAX_QUERY_VECTORS:
+                self._query_vectors.popitem(last=False)
+
+    def query(
+        self,
+        kind: str,
+        text: str,
+        *,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> dict[str, Any] | None:
+        """Return a local result, or None when the core must be asked."""
+        if self._layout is None or not self.fresh(kind):
+            return None
+        vector = self._vector(text)
+        if vector is None:
+            return None
+        offset = offset or 0
+        limit = limit if limit is not None else 10
+        matches = self._kinds[kind].search(vector, offset + limit)
+        key, scored, status = self._layout
+        results = []
+        for record, score in matches[offset:]:
+            result = dict(record)
+            if scored:
+                result["score"] = round(score, 4)
+            results.append(result)
+        response: dict[str, Any] = {key: results}
+        if status is not None:
+            response["status"] = status
+        return response
+
+    def add(self, kind: str, record: dict[str, Any]) -> bool:
+        """Index a record written through the integration."""
+        record_id = _record_id(record)
+        if record_id is None or not isinstance(record.get("content"), str):
+            return False
+        vector = self._record_vector(record)
+        if vector is None:
+            return False
+        rebuilding = self._rebuilding.get(kind)
+        if rebuilding is not None:
+            rebuilding.upsert(record_id, record, vector)
+        return self._kind(kind).upsert(record_id, record, vector)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sync_supported": self._sync_supported,
+            "query_vectors": len(self._query_vectors),
+            "kinds": {
+                kind: {
+                    "records": len(index.ids),
+                    "fresh": self.fresh(kind),
+                    "incremental": index.tombstones,
+                }
+                for kind, index in self._kinds.items()
+            },
+        }
+
+    async def async_sync(self, client: HAAgentApi) -> None:
+        """Bring every tracked kind up to date with the core."""
+        if self._sync_supported is False or self._sync_lock.locked():
+            return
+        async with self._sync_lock:
+            for kind in list(self._kinds):
+                try:
+                    await self._async_sync_kind(client, kind)
+                except HomeAssistantError as err:
+                    if getattr(err, "status", None) == 404:
+                        _LOGGER.info(
+                            "ha_agent_core has no /memory/records; "
+                            "memory queries will stay remote"
+                        )
+                        self._sync_supported = False
+                        return
+                    _LOGGER.debug("Memory mirror sync of %s failed: %s", kind, err)
+
+    async def _async_sync_kind(self, client: HAAgentApi, kind: str) -> None:
+        current = self._kind(kind)
+        try:
+            if current.synced_at is None or not current.complete:
+                await self._async_rebuild(client, kind)
+                return
+            if current.tombstones:
+                await self._async_pull(client, kind, current)
+            else:
+                # Reconcile first so offset paging starts past live records.
+                listed = await self._async_reconcile(client, kind, current)
+                await self._async_pull(client, kind, current)
+                if not listed.issubset(current.rows):
+                    current.complete = False
+        except _PagingStalled:
+            _LOGGER.debug("Memory mirror sync of %s stopped early", kind)
+            current.complete = False
+        # Without every record indexed local answers could miss matches.
+        current.synced_at = (
+            asyncio.get_running_loop().time() if current.complete else None
+        )
+
+    async def _async_rebuild(self, client: HAAgentApi, kind: str) -> None:
+        """Pull every record into a new index and swap it in when complete."""
+        index = self._rebuilding[kind] = _KindIndex()
+        try:
+            await self._async_pull(client, kind, index)
+        except _PagingStalled:
+            _LOGGER.debug("Memory mirror rebuild of %s stopped early", kind)
+            return
+        finally:
+            self._rebuilding.pop(kind, None)
+        if index.complete:
+            index.synced_at = asyncio.get_running_loop().time()
+        self._kinds[kind] = index
+
+    async def _async_pull(
+        self, client: HAAgentApi, kind: str, index: _KindIndex
+    ) -> None:
+        """Add records after ``index.last_id`` and apply reported deletions."""
+        async for records, deleted in self._async_pages(
+            client, kind, index.last_id, embeddings=True, known=set(index.rows)
+        ):
+            if deleted is not None:
+                index.tombstones = True
+                for record_id in deleted:
+                    index.remove(str(record_id))
+            for record in records:
+                vector = self._record_vector(record)
+                if vector is None or not index.upsert(
+                    _record_id(record), record, vector
+                ):
+                    index.complete = False
+            if records:
+                index.last_id = _record_id(records[-1])
+
+    async def _async_reconcile(
+        self, client: HAAgentApi, kind: str, index: _KindIndex
+    ) -> set[str]:
+        """Drop records deleted or edited on a core that reports neither.
+
+        Lists the kind without embeddings, which is much smaller than a full
+        pull. An edited record is dropped and the next sync rebuilds the kind,
+        since its new vector can only come with a full pull. Returns the ids
+        listed, which the pull that follows must have indexed.
+        """
+        listed: dict[str, str] = {}
+        async for records, _deleted in self._async_pages(
+            client, kind, None, embeddings=False
+        ):
+            for record in records:
+                listed[_record_id(record)] = record["content"]
+        for record_id, record in list(zip(index.ids, index.records)):
+            content = listed.get(record_id)
+            if content is None:
+                index.remove(record_id)
+            elif content != record.get("content"):
+                index.remove(record_id)
+                index.complete = False
+        return set(listed)
+
+    async def _async_pages(
+        self,
+        client: HAAgentApi,
+        kind: str,
+        since_id: str | None,
+        *,
+        embeddings: bool,
+        known: Collection[str] = (),
+    ) -> AsyncIterator[tuple[list[dict[str, Any]], list[Any] | None]]:
+        """Yield records not in ``known`` and deleted ids page by page.
+
+        As with the journal mirror, a page repeating records already seen
+        means the core ignored ``since_id``; paging continues by offset, past
+        the ``known`` records, and raises _PagingStalled if the core ignores
+        that too.
+        """
+        seen: set[str] = set()
+        offset = len(known) if self._offset_paging and since_id is not None else None
+        while True:
+            page = await client.async_memory_records(
+                kind,
+                since_id=since_id if offset is None else None,
+                offset=offset,
+                limit=SYNC_PAGE_SIZE,
+                embeddings=embeddings,
+            )
+            self._sync_supported = True
+            if not isinstance(page, dict):
+                return
+            raw = page.get("records") or []
+            records = [
+                record
+                for record in raw
+                if isinstance(record, dict)
+                and _record_id(record) is not None
+                and isinstance(record.get("content"), str)
+            ]
+            fresh = [
+                record
+                for record in records
+                if (record_id := _record_id(record)) not in seen
+                and record_id not in known
+            ]
+            if records and not fresh:
+                if offset is not None:
+                    raise _PagingStalled
+                self._offset_paging = True
+                offset = len(known) + len(seen)
+                continue
+            seen.update(_record_id(record) for record in fresh)
+            deleted = page.get("deleted")
+            yield fresh, deleted if isinstance(deleted, list) else None
+            if len(raw) < SYNC_PAGE_SIZE:
+                return
+            if offset is None:
+                since_id = _record_id(records[-1])
+            else:
+                offset += len(raw)
@@ -1,9 +1,49 @@
+const LIST_ROW_HEIGHT = 44;
+const LIST_OVERSCAN = 8;
+const ENTITY_PAGE_SIZE = 500;
+const ENTITY_LIST_FIELDS = "entity_id,name,area,device,device_class";
+
+const escapeHtml = (value) =>
+  String(value ?? "")
+    .replace(/&/g, "&amp;")
+    .replace(/</g, "&lt;")
+    .replace(/>/g, "&gt;")
+    .replace(/"/g, "&quot;");
+
+// Lists are kept as indexed copies ({ item, id, search, sortKeys }) so that
+// filtering and sorting never touch the DOM, and only the rows inside the
+// viewport are rendered.
+const indexListItem = (item) => {
+  const id = item.entity_id || "";
+  const name = item.name || "";
+  const area = item.area || "";
+  return {
+    item,
+    id,
+    search: [id, name, area, item.device, item.device_class]
+      .filter((value) => value)
+      .join(" ")
+      .toLowerCase(),
+    sortKeys: {
+      entity_id: id.toLowerCase(),
+      name: name.toLowerCase(),
+      area: area.toLowerCase(),
+    },
+  };
+};
+
 class HAAgentPanel extends HTMLElement {
   constructor() {
     super();
     this.attachShadow({ mode: "open" });
     this._entities = [];
-    this._suggestions = null;
+    this._entityTotal = 0;
+    this._suggestions = new Map();
+    this._listMode = "suggestions";
+    this._listFilter = "";
+    this._listSort = "entity_id";
+    this._listView = null;
+    this._listFrame = null;
     this._status = "Loading entities...";
     this._baseUrl = "";
     this._openaiKeyPresent = false;
@@ -14,7 +54,28 @@ class HAAgentPanel extends HTMLElement {
     this._ttsModel = "";
     this._sttModel = "";
     this._instruction = "";
+    this._configVersion = null;
+    // Sent with saves so this panel can tell its own config events apart.
+    this._origin = Math.random().toString(36).slice(2);
     this._validation = null;
+    this._backends = [];
+  }
+
+  _renderBackends() {
+    if (!this._backends.length) {
+      return "";
+    }
+    const rows = this._backends
+      .map((backend) => {
+        const latency =
+          backend.latency_ms === null || backend.latency_ms === undefined
+            ? "n/a"
+            : `${backend.latency_ms} ms`;
+        const health = backend.healthy ? "healthy" : "unhealthy";
+        return `${escapeHtml(backend.url)} · ${health} · ${latency} · ${backend.requests} req / ${backend.errors} err`;
+      })
+      .join("<br />");
+    return `<div class="status">${rows}</div>`;
   }
 
   _renderModelOptions(selected, options) {
@@ -32,18 +93,157 @@ class HAAgentPanel extends HTMLElement {
       this._loaded = true;
       this._loadSettings();
       this._loadEntities();
+      this._loadSuggestions();
+      this._subscribeSuggestions();
+      this._subscribeConfig();
       this._render();
     }
   }
 
+  disconnectedCallback() {
+    if (this._unsubSuggestions) {
+      this._unsubSuggestions.then((unsub) => unsub()).catch(() => {});
+      this._unsubSuggestions = null;
+    }
+    if (this._unsubConfig) {
+      this._unsubConfig.then((unsub) => unsub()).catch(() => {});
+      this._unsubConfig = null;
+    }
+    this._loaded = false;
+  }
+
+  _mergeSuggestions(items) {
+    (items || []).forEach((item) => {
+      if (item && item.entity_id) {
+        this._suggestions.set(item.entity_id, indexListItem(item));
+      }
+    });
+    if (this._listMode === "suggestions") {
+      this._invalidateList();
+    }
+  }
+
+  _invalidateList() {
+    this._listView = null;
+    this._scheduleList();
+  }
+
+  _scheduleList() {
+    if (this._listFrame !== null) {
+      return;
+    }
+    this._listFrame = requestAnimationFrame(() => {
+      this._listFrame = null;
+      this._renderList();
+    });
+  }
+
+  _listItems() {
+    if (this._listView) {
+      return this._listView;
+    }
+    const source =
+      this._listMode === "suggestions"
+        ? Array.from(this._suggestions.values())
+        : this._entities;
+    const tokens = this._listFilter.toLowerCase().split(/\s+/).filter((t) => t);
+    const matched = tokens.length
+      ? source.filter((entry) => tokens.every((t) => entry.search.includes(t)))
+      : source.slice();
+    const key = this._listSort;
+    matched.sort((a, b) => {
+      const left = a.sortKeys[key];
+      const right = b.sortKeys[key];
+      if (left !== right) {
+        return left < right ? -1 : 1;
+      }
+      return a.id < b.id ? -1 : a.id > b.id ? 1 : 0;
+    });
+    this._listView = matched;
+    return matched;
+  }
+
+  _listRow(entry) {
+    const row = document.createElement("div");
+    row.className = "list-row";
+    const title = document.createElement("div");
+    title.className = "list-title";
+    title.textContent = entry.item.name ? `${entry.item.name} · ${entry.id}` : entry.id;
+    const detail = document.createElement("div");
+    detail.className = "list-detail";
+    if (this._listMode === "suggestions") {
+      const { entity_id, ...rest } = entry.item;
+      detail.textContent = JSON.stringify(rest);
+    } else {
+      detail.textContent = [entry.item.area, entry.item.device, entry.item.device_class]
+        .filter((value) => value)
+        .join(" · ");
+    }
+    row.append(title, detail);
+    return row;
+  }
+
+  _renderList() {
+    const viewport = this.shadowRoot && this.shadowRoot.getElementById("list-viewport");
+    if (!viewport) {
+      return;
+    }
+    const items = this._listItems();
+    const total =
+      this._listMode === "suggestions" ? this._suggestions.size : this._entities.length;
+    this.shadowRoot.getElementById("list-spacer").style.height =
+      `${items.length * LIST_ROW_HEIGHT}px`;
+    this.shadowRoot.getElementById("list-count").textContent =
+      `${items.length} of ${total}`;
+    const first = Math.max(
+      0,
+      Math.floor(viewport.scrollTop / LIST_ROW_HEIGHT) - LIST_OVERSCAN
+    );
+    const last = Math.min(
+      items.length,
+      first + Math.ceil(viewport.clientHeight / LIST_ROW_HEIGHT) + 2 * LIST_OVERSCAN
+    );
+    const rows = this.shadowRoot.getElementById("list-rows");
+    rows.style.transform = `translateY(${first * LIST_ROW_HEIGHT}px)`;
+    const fragment = document.createDocumentFragment();
+    for (let i = first; i < last; i += 1) {
+      fragment.appendChild(this._listRow(items[i]));
+    }
+    rows.replaceChildren(fragment);
+  }
+
+  _setStatus(text) {
+    this._status = text;
+    const el = this.shadowRoot && this.shadowRoot.getElementById("status");
+    if (el) {
+      el.textContent = text;
+    }
+  }
+
+  _describeProgress(progress) {
+    if (!progress) {
+      return "";
+    }
+    const failed = progress.failed ? `, ${progress.failed} failed` : "";
+    if (progress.running) {
+      return `Suggesting... ${progress.done}/${progress.total} entities refreshed${failed}.`;
+    }
+    if (progress.failed) {
+      return `Suggest finished with ${progress.failed} of ${progress.total} entities failed: ${progress.error}`;
+    }
+    if (progress.error) {
+      return `Suggest failed: ${progress.error}`;
+    }
+    return "";
+  }
+
   _render() {
     if (!this.shadowRoot) {
       return;
     }
-    const entityCount = this._entities.length;
-    const suggestions = this._suggestions
-      ? JSON.stringify(this._suggestions, null, 2)
-      : "";
+    const entityCount = this._entityTotal || this._entities.length;
+    const previousViewport = this.shadowRoot.getElementById("list-viewport");
+    const scrollTop = previousViewport ? previousViewport.scrollTop : 0;
 
     this.shadowRoot.innerHTML = `
       <style>
@@ -122,6 +322,52 @@ class HAAgentPanel extends HTMLElement {
           margin-top: 8px;
           opacity: 0.75;
         }
+        .list-toolbar input {
+          flex: 1;
+          min-width: 180px;
+          padding: 8px 10px;
+          border-radius: 8px;
+          border: 1px solid rgba(0, 0, 0, 0.2);
+          background: rgba(255, 255, 255, 0.8);
+        }
+        .list-toolbar select {
+          flex: 0 0 auto;
+          min-width: 0;
+        }
+        #list-viewport {
+          position: relative;
+          height: 420px;
+          overflow-y: auto;
+          border-radius: 10px;
+          background: rgba(0, 0, 0, 0.05);
+          contain: strict;
+        }
+        #list-rows {
+          position: absolute;
+          top: 0;
+          left: 0;
+          right: 0;
+          will-change: transform;
+        }
+        .list-row {
+          height: ${LIST_ROW_HEIGHT}px;
+          box-sizing: border-box;
+          padding: 4px 12px;
+          border-bottom: 1px solid rgba(0, 0, 0, 0.06);
+          overflow: hidden;
+        }
+        .list-title, .list-detail {
+          white-space: nowrap;
+          overflow: hidden;
+          text-overflow: ellipsis;
+        }
+        .list-title {
+          font-size: 14px;
+        }
+        .list-detail {
+          font-size: 12px;
+          opacity: 0.7;
+        }
         pre {
           background: rgba(0, 0, 0, 0.08);
           padding: 12px;
@@ -143,13 +389,14 @@ class HAAgentPanel extends HTMLElement {
       </style>
       <div class="wrap">
         <h1>Home Assistant Agent</h1>
-        <p>Placeholder panel for onboarding. Entities discovered: ${entityCount}</p>
+        <p>Placeholder panel for onboarding. Entities discovered: <span id="entity-count">${entityCount}</span></p>
         <h2>Connection</h2>
-        <p class="subtitle">Configure the ha_agent_core add-on base URL.</p>
+        <p class="subtitle">Configure the ha_agent_core add-on base URL. Separate multiple backends with commas; the fastest healthy one is used.</p>
         <div class="row">
-          <input id="base-url" type="text" placeholder="http://core-ha_agent_core" value="${this._baseUrl || ""}" />
+          <input id="base-url" type="text" placeholder="http://core-ha_agent_core" value="${escapeHtml(this._baseUrl)}" />
           <button id="check-addon" class="secondary">Check Add-on</button>
         </div>
+        ${this._renderBackends()}
         <h2>API Keys</h2>
         <p class="subtitle">Provide one or more keys to unlock model choices.</p>
         <div class="row">
@@ -223,17 +470,34 @@ class HAAgentPanel extends HTMLElement {
           <button id="run-suggest" class="secondary">Run Suggest</button>
         </div>
         <div class="status">
-          OpenAI key: ${this._openaiKeyPresent ? "stored" : "not set"} ·
-          Anthropic key: ${this._anthropicKeyPresent ? "stored" : "not set"} ·
-          Gemini key: ${this._geminiKeyPresent ? "stored" : "not set"}
+          OpenAI key: ${this._renderKeyState("openai_key", this._openaiKeyPresent)} ·
+          Anthropic key: ${this._renderKeyState("anthropic_key", this._anthropicKeyPresent)} ·
+          Gemini key: ${this._renderKeyState("gemini_key", this._geminiKeyPresent)}
         </div>
         ${
           this._validation
             ? `<pre>${JSON.stringify(this._validation, null, 2)}</pre>`
             : ""
         }
-        <div class="status">${this._status}</div>
-        ${suggestions ? `<pre>${suggestions}</pre>` : ""}
+        <div class="status" id="status">${escapeHtml(this._status)}</div>
+        <h2>${this._listMode === "suggestions" ? "Suggestions" : "Entities"}</h2>
+        <div class="row list-toolbar">
+          <select id="list-mode">
+            <option value="suggestions" ${this._listMode === "suggestions" ? "selected" : ""}>Suggestions</option>
+            <option value="entities" ${this._listMode === "entities" ? "selected" : ""}>Entities</option>
+          </select>
+          <input id="list-filter" type="search" placeholder="Filter" value="${escapeHtml(this._listFilter)}" />
+          <select id="list-sort">
+            <option value="entity_id" ${this._listSort === "entity_id" ? "selected" : ""}>Entity ID</option>
+            <option value="name" ${this._listSort === "name" ? "selected" : ""}>Name</option>
+            <option value="area" ${this._listSort === "area" ? "selected" : ""}>Area</option>
+          </select>
+          <span class="status" id="list-count"></span>
+        </div>
+        <div id="list-viewport">
+          <div id="list-spacer"></div>
+          <div id="list-rows"></div>
+        </div>
       </div>
     `;
 
@@ -252,7 +516,10 @@ class HAAgentPanel extends HTMLElement {
       "model-fast",
       "tts-model",
       "stt-model",
-      "instruction"
+      "instruction",
+      "list-filter",
+      "list-mode",
+      "list-sort"
     ];
     stopIds.forEach((id) => {
       const el = this.shadowRoot.getElementById(id);
@@ -269,12 +536,33 @@ class HAAgentPanel extends HTMLElement {
       this._runSuggest();
     this.shadowRoot.getElementById("check-addon").onclick = () =>
       this._checkAddon();
+    this.shadowRoot.querySelectorAll(".clear-key").forEach((el) => {
+      el.onclick = () => this._clearKey(el.dataset.field);
+    });
+
+    const viewport = this.shadowRoot.getElementById("list-viewport");
+    viewport.addEventListener("scroll", () => this._scheduleList(), { passive: true });
+    this.shadowRoot.getElementById("list-filter").addEventListener("input", (event) => {
+      this._listFilter = event.target.value || "";
+      viewport.scrollTop = 0;
+      this._invalidateList();
+    });
+    this.shadowRoot.getElementById("list-sort").onchange = (event) => {
+      this._listSort = event.target.value;
+      this._invalidateList();
+    };
+    this.shadowRoot.getElementById("list-mode").onchange = (event) => {
+      this._listMode = event.target.value;
+      this._render();
+    };
+    viewport.scrollTop = scrollTop;
+    this._invalidateList();
   }
 
   async _loadSettings() {
     try {
       const data = await this._hass.callApi("GET", "home_assistant_agent/settings");
-      this._baseUrl = data.base_url || "";
+      this._baseUrl = (data.base_urls || [data.base_url || ""]).join(", ");
       this._openaiKeyPresent = Boolean(data.openai_key_present);
       this._anthropicKeyPresent = Boolean(data.anthropic_key_present);
       this._geminiKeyPresent = Boolean(data.gemini_key_present);
@@ -283,6 +571,7 @@ class HAAgentPanel extends HTMLElement {
       this._ttsModel = data.tts_model || "";
       this._sttModel = data.stt_model || "";
       this._instruction = data.instruction || "";
+      this._configVersion = data.version ?? null;
       if (!this._baseUrl) {
         this._status = "Add-on base URL not set.";
       }
@@ -293,21 +582,53 @@ class HAAgentPanel extends HTMLElement {
   }
 
   async _loadEntities() {
+    // Page through the registry and append each chunk as it arrives instead
+    // of waiting for one large response.
+    const entities = [];
+    this._entities = entities;
+    let cursor = null;
     try {
-      const data = await this._hass.callApi(
-        "GET",
-        "home_assistant_agent/entities"
-      );
-      this._entities = data.entities || [];
-      this._status = `Loaded ${this._entities.length} entities.`;
+      do {
+        const params = new URLSearchParams({
+          limit: String(ENTITY_PAGE_SIZE),
+          fields: ENTITY_LIST_FIELDS,
+        });
+        if (cursor) {
+          params.set("cursor", cursor);
+        }
+        const data = await this._hass.callApi(
+          "GET",
+          `home_assistant_agent/entities?${params}`
+        );
+        if (this._entities !== entities) {
+          return;
+        }
+        (data.entities || []).forEach((item) => entities.push(indexListItem(item)));
+        this._entityTotal = data.total || entities.length;
+        cursor = data.next_cursor;
+        const countEl = this.shadowRoot.getElementById("entity-count");
+        if (countEl) {
+          countEl.textContent = String(this._entityTotal);
+        }
+        this._setStatus(
+          cursor
+            ? `Loading entities... ${entities.length}/${this._entityTotal}`
+            : `Loaded ${entities.length} entities.`
+        );
+        if (this._listMode === "entities") {
+          this._invalidateList();
+        }
+      } while (cursor);
     } catch (err) {
-      this._status = `Failed to load entities: ${err}`;
+      this._setStatus(`Failed to load entities: ${err}`);
     }
-    this._render();
   }
 
   async _saveSettings() {
-    const baseUrl = this.shadowRoot.getElementById("base-url").value || "";
+    const baseUrls = (this.shadowRoot.getElementById("base-url").value || "")
+      .split(",")
+      .map((url) => url.trim())
+      .filter((url) => url);
     const openaiKey = this.shadowRoot.getElementById("openai-key").value || "";
     const anthropicKey = this.shadowRoot.getElementById("anthropic-key").value || "";
     const geminiKey = this.shadowRoot.getElementById("gemini-key").value || "";
@@ -318,7 +639,8 @@ class HAAgentPanel extends HTMLElement {
     const instruction = this.shadowRoot.getElementById("instruction").value || "";
     try {
       const result = await this._hass.callApi("POST", "home_assistant_agent/settings", {
-        base_url: baseUrl,
+        base_url: baseUrls[0] || "",
+        base_urls: baseUrls,
         openai_key: openaiKey,
         anthropic_key: anthropicKey,
         gemini_key: geminiKey,
@@ -327,9 +649,13 @@ class HAAgentPanel extends HTMLElement {
         tts_model: ttsModel,
         stt_model: sttModel,
         instruction,
+        version: this._configVersion ?? undefined,
+        origin: this._origin,
         validate: true
       });
-      this._baseUrl = result.base_url || this._baseUrl;
+      this._baseUrl = result.base_urls
+        ? result.base_urls.join(", ")
+        : result.base_url || this._baseUrl;
       this._openaiKeyPresent = Boolean(result.openai_key_present);
       this._anthropicKeyPresent = Boolean(result.anthropic_key_present);
       this._geminiKeyPresent = Boolean(result.gemini_key_present);
@@ -338,17 +664,74 @@ class HAAgentPanel extends HTMLElement {
       this._ttsModel = result.tts_model || this._ttsModel;
       this._sttModel = result.stt_model || this._sttModel;
       this._instruction = result.instruction || this._instruction;
+      this._configVersion = result.version ?? this._configVersion;
       this._validation = result.validation || null;
       this._status = "Settings saved.";
     } catch (err) {
-      this._status = `Failed to save settings: ${err}`;
+      if (err && err.status_code === 409) {
+        await this._loadSettings();
+        this._setStatus("Settings were changed elsewhere and have been reloaded; save again.");
+        return;
+      }
+      this._status = `Failed to save settings: ${(err && err.body && err.body.error) || err}`;
+    }
+    this._render();
+  }
+
+  _renderKeyState(field, present) {
+    if (!present) {
+      return "not set";
+    }
+    return `stored <button class="secondary clear-key" data-field="${field}">Clear</button>`;
+  }
+
+  async _clearKey(field) {
+    // An empty key field means "leave unchanged"; null clears the stored key.
+    try {
+      const result = await this._hass.callApi("POST", "home_assistant_agent/settings", {
+        [field]: null,
+        version: this._configVersion ?? undefined,
+        origin: this._origin
+      });
+      this._openaiKeyPresent = Boolean(result.openai_key_present);
+      this._anthropicKeyPresent = Boolean(result.anthropic_key_present);
+      this._geminiKeyPresent = Boolean(result.gemini_key_present);
+      this._configVersion = result.version ?? this._configVersion;
+      this._status = "API key cleared.";
+    } catch (err) {
+      if (err && err.status_code === 409) {
+        await this._loadSettings();
+        this._setStatus("Settings were changed elsewhere and have been reloaded; try again.");
+        return;
+      }
+      this._status = `Failed to clear API key: ${err}`;
     }
     this._render();
   }
 
+  _subscribeConfig() {
+    if (!this._hass.connection || this._unsubConfig) {
+      return;
+    }
+    // Another tab or a background revalidation changed the add-on config;
+    // the settings endpoint serves it from cache, so reloading is cheap.
+    this._unsubConfig = this._hass.connection.subscribeMessage(
+      (event) => {
+        if (event.origin === this._origin) {
+          return;
+        }
+        if (event.version !== this._configVersion || event.version === null) {
+          this._loadSettings().then(() => this._setStatus("Settings updated elsewhere."));
+        }
+      },
+      { type: "home_assistant_agent/config/subscribe" }
+    );
+  }
+
   async _checkAddon() {
     try {
       const result = await this._hass.callApi("GET", "home_assistant_agent/health");
+      this._backends = result.backends || [];
       if (result.status === "success") {
         this._status = "Add-on is reachable.";
       } else {
@@ -360,21 +743,54 @@ class HAAgentPanel extends HTMLElement {
     this._render();
   }
 
+  async _loadSuggestions() {
+    try {
+      const data = await this._hass.callApi("GET", "home_assistant_agent/suggest");
+      this._mergeSuggestions(data.suggestions);
+      this._setStatus(this._describeProgress(data.progress) || this._status);
+    } catch (err) {
+      this._setStatus(`Failed to load suggestions: ${err}`);
+    }
+  }
+
+  _subscribeSuggestions() {
+    if (!this._hass.connection || this._unsubSuggestions) {
+      return;
+    }
+    this._unsubSuggestions = this._hass.connection.subscribeMessage(
+      (event) => {
+        this._mergeSuggestions(event.suggestions);
+        if (event.type === "complete") {
+          this._setStatus(this._describeProgress(event) || "Suggestions up to date.");
+        } else {
+          this._setStatus(this._describeProgress(event));
+        }
+      },
+      { type: "home_assistant_agent/suggest/subscribe" }
+    );
+  }
+
   async _runSuggest() {
     const input = this.shadowRoot.getElementById("llm-key");
-    const llmKey = input.value || "";
+    const llmKey = input ? input.value : "";
     try {
       const result = await this._hass.callApi("POST", "home_assistant_agent/suggest", {
         llm_key: llmKey || undefined,
         use_llm: true,
-        entities: this._entities,
       });
-      this._suggestions = result;
-      this._status = "Suggestions received.";
+      this._mergeSuggestions(result.suggestions);
+      if (result.pending) {
+        this._setStatus(
+          result.started
+            ? `Loaded ${result.suggestions.length} cached suggestions; refreshing ${result.pending} changed entities...`
+            : this._describeProgress(result.progress) || "A suggestion refresh is already running."
+        );
+      } else {
+        this._setStatus("Suggestions up to date.");
+      }
     } catch (err) {
-      this._status = `Suggest failed: ${err}`;
+      this._setStatus(`Suggest failed: ${err}`);
     }
-    this._render();
   }
 }
 
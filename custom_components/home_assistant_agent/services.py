@@ -0,0 +1,126 @@
+"""Services for Home Assistant Agent."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .api import HAAgentApi
+from .const import (
+    DOMAIN,
+    SERVICE_MEMORY_QUERY,
+    SERVICE_MEMORY_WRITE,
+    SERVICE_SEARCH_JOURNALS,
+)
+from .journal_index import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, JournalIndex
+
+SEARCH_JOURNALS_SCHEMA = vol.Schema(
+    {
+        vol.Required("query"): cv.string,
+        vol.Optional("journal"): cv.string,
+        vol.Optional("limit", default=DEFAULT_SEARCH_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_SEARCH_LIMIT)
+        ),
+    }
+)
+
+MEMORY_QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): cv.string,
+        vol.Required("kind"): cv.string,
+        vol.Required("text"): cv.string,
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1, max=200)),
+        vol.Optional("offset"): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    }
+)
+
+MEMORY_WRITE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): cv.string,
+        vol.Required("kind"): cv.string,
+        vol.Required("content"): cv.string,
+        vol.Optional("source"): cv.string,
+        vol.Optional("metadata"): dict,
+    }
+)
+
+
+def get_journal_index(hass: HomeAssistant) -> JournalIndex:
+    index: JournalIndex | None = hass.data.get(DOMAIN, {}).get("journal_index")
+    if index is None:
+        raise ServiceValidationError(
+            "The journal mirror is not enabled in the integration options"
+        )
+    return index
+
+
+def get_client(hass: HomeAssistant, entry_id: str | None) -> HAAgentApi:
+    entries: dict = hass.data.get(DOMAIN, {}).get("entries", {})
+    if entry_id is None and entries:
+        entry_id = next(iter(entries))
+    entry_data = entries.get(entry_id)
+    if entry_data is None:
+        raise ServiceValidationError("No loaded Home Assistant Agent entry found")
+    return entry_data["client"]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    async def _async_search_journals(call: ServiceCall) -> ServiceResponse:
+        results = await get_journal_index(hass).async_search(
+            call.data["query"],
+            journal=call.data.get("journal"),
+            limit=call.data["limit"],
+        )
+        return {"results": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH_JOURNALS,
+        _async_search_journals,
+        schema=SEARCH_JOURNALS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_memory_query(call: ServiceCall) -> ServiceResponse:
+        client = get_client(hass, call.data.get("entry_id"))
+        return await client.async_memory_query(
+            call.data["kind"],
+            call.data["text"],
+            limit=call.data.get("limit"),
+            offset=call.data.get("offset"),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MEMORY_QUERY,
+        _async_memory_query,
+        schema=MEMORY_QUERY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_memory_write(call: ServiceCall) -> ServiceResponse:
+        client = get_client(hass, call.data.get("entry_id"))
+        return await client.async_memory_write(
+            call.data["kind"],
+            call.data["content"],
+            source=call.data.get("source"),
+            metadata=call.data.get("metadata"),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MEMORY_WRITE,
+        _async_memory_write,
+        schema=MEMORY_WRITE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
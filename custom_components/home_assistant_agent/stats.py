@@ -0,0 +1,44 @@
+"""Lightweight runtime counters surfaced through diagnostics."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one integration-side cache."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, hit: bool, count: int = 1) -> None:
+        if hit:
+            self.hits += count
+        else:
+            self.misses += count
+
+    def as_dict(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
+
+
+def cache_stats(hass: HomeAssistant, name: str) -> CacheStats:
+    """Return the named cache counters, creating them on first use."""
+    domain_data = hass.data.get(DOMAIN)
+    if domain_data is None:
+        return CacheStats()
+    caches = domain_data.setdefault("cache_stats", {})
+    stats = caches.get(name)
+    if stats is None:
+        stats = caches[name] = CacheStats()
+    return stats
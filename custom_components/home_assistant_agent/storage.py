@@ -15,6 +15,16 @@ STORAGE_KEY = "home_assistant_agent"
 STORAGE_VERSION = 1
 
 
+def _entry_settings(entry: dict[str, Any]) -> dict[str, Any]:
+    base_urls = [url for url in entry.get("base_urls") or [] if url]
+    if not base_urls:
+        base_urls = [entry.get("base_url", DEFAULT_BASE_URL)]
+    return {
+        "base_url": base_urls[0],
+        "base_urls": base_urls,
+    }
+
+
 class HAAgentStorage:
     """Persist settings without reloading config entries."""
 
@@ -31,9 +41,7 @@ class HAAgentStorage:
         data = await self.async_load()
         entries = data.setdefault("entries", {})
         entry = entries.get(entry_id) or {}
-        return {
-            "base_url": entry.get("base_url", DEFAULT_BASE_URL),
-        }
+        return _entry_settings(entry)
 
     async def async_entry_exists(self, entry_id: str) -> bool:
         data = await self.async_load()
@@ -52,6 +60,4 @@ class HAAgentStorage:
         entry.update({k: v for k, v in updates.items() if v is not None})
         entries[entry_id] = entry
         await self._store.async_save(data)
-        return {
-            "base_url": entry.get("base_url", DEFAULT_BASE_URL),
-        }
+        return _entry_settings(entry)
@@ -0,0 +1,97 @@
+"""Speech-to-text platform backed by ha_agent_core."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable
+import logging
+
+from homeassistant.components.stt import (
+    AudioBitRates,
+    AudioChannels,
+    AudioCodecs,
+    AudioFormats,
+    AudioSampleRates,
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+    SpeechToTextEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, SPEECH_LANGUAGES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    async_add_entities([HAAgentSTTEntity(hass, entry)])
+
+
+class HAAgentSTTEntity(SpeechToTextEntity):
+    """Stream captured audio to ha_agent_core for transcription."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Speech-to-text"
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self.hass = hass
+        self._entry_id = entry.entry_id
+        self._attr_unique_id = f"{entry.entry_id}_stt"
+
+    @property
+    def supported_languages(self) -> list[str]:
+        return SPEECH_LANGUAGES
+
+    @property
+    def supported_formats(self) -> list[AudioFormats]:
+        return [AudioFormats.WAV, AudioFormats.OGG]
+
+    @property
+    def supported_codecs(self) -> list[AudioCodecs]:
+        return [AudioCodecs.PCM, AudioCodecs.OPUS]
+
+    @property
+    def supported_bit_rates(self) -> list[AudioBitRates]:
+        return [AudioBitRates.BITRATE_16]
+
+    @property
+    def supported_sample_rates(self) -> list[AudioSampleRates]:
+        return [AudioSampleRates.SAMPLERATE_16000]
+
+    @property
+    def supported_channels(self) -> list[AudioChannels]:
+        return [AudioChannels.CHANNEL_MONO]
+
+    async def async_process_audio_stream(
+        self, metadata: SpeechMetadata, stream: AsyncIterable[bytes]
+    ) -> SpeechResult:
+        entry_data = (
+            self.hass.data.get(DOMAIN, {}).get("entries", {}).get(self._entry_id, {})
+        )
+        client = entry_data.get("client")
+        if not client:
+            return SpeechResult(None, SpeechResultState.ERROR)
+        try:
+            result = await client.async_stt_stream(
+                stream,
+                language=metadata.language,
+                audio_format=metadata.format.value,
+                codec=metadata.codec.value,
+                sample_rate=metadata.sample_rate.value,
+                bit_rate=metadata.bit_rate.value,
+                channels=metadata.channel.value,
+            )
+        except HomeAssistantError as err:
+            _LOGGER.warning("Speech-to-text failed: %s", err)
+            return SpeechResult(None, SpeechResultState.ERROR)
+        text = result.get("text") if isinstance(result, dict) else None
+        if not text:
+            return SpeechResult(None, SpeechResultState.ERROR)
+        return SpeechResult(text, SpeechResultState.SUCCESS)
@@ -0,0 +1,311 @@
+"""Persistent entity suggestion cache for Home Assistant Agent."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+import hashlib
+import json
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .api import HAAgentApi, HAAgentResponseError
+from .const import DOMAIN
+from .entities import Entity, entity_dict
+from .stats import cache_stats
+
+_LOGGER = logging.getLogger(__name__)
+
+SUGGESTIONS_STORAGE_KEY = "home_assistant_agent.suggestions"
+SUGGESTIONS_STORAGE_VERSION = 1
+SUGGEST_BATCH_SIZE = 50
+SUGGEST_CONCURRENCY = 4
+SUGGEST_SHARD_RETRIES = 2
+SUGGEST_RETRY_DELAY = 2.0
+# Client errors other than these mean the shard itself was rejected.
+RETRYABLE_CLIENT_STATUSES = {408, 429}
+SAVE_DELAY = 10
+PARTITION_CHUNK = 1000
+
+
+def entity_hash(entity: Entity) -> str:
+    """Hash the registry fields a suggestion depends on.
+
+    A record hashes the same as its dict form, so cached results survive
+    either representation.
+    """
+    encoded = json.dumps(
+        entity, sort_keys=True, separators=(",", ":"), default=entity_dict
+    )
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def shard_entities(
+    entities: list[Entity], size: int = SUGGEST_BATCH_SIZE
+) -> list[list[Entity]]:
+    """Split entities into shards of at most ``size``, keeping areas together.
+
+    Entities of one area stay in the same shard where they fit, which gives
+    the model related entities side by side; small areas share a shard.
+    """
+    by_area: dict[str | None, list[Entity]] = {}
+    for entity in entities:
+        by_area.setdefault(entity.get("area"), []).append(entity)
+    shards: list[list[Entity]] = []
+    current: list[Entity] = []
+    for group in by_area.values():
+        for start in range(0, len(group), size):
+            chunk = group[start : start + size]
+            if current and len(current) + len(chunk) > size:
+                shards.append(current)
+                current = []
+            current.extend(chunk)
+    if current:
+        shards.append(current)
+    return shards
+
+
+def _split_suggestions(result: Any) -> dict[str, Any]:
+    """Map an /entity/suggest response to per-entity suggestions."""
+    if not isinstance(result, dict):
+        return {}
+    items = result.get("suggestions")
+    if not isinstance(items, list):
+        items = result.get("entities")
+    if not isinstance(items, list):
+        return {}
+    return {
+        item["entity_id"]: item
+        for item in items
+        if isinstance(item, dict) and isinstance(item.get("entity_id"), str)
+    }
+
+
+class HAAgentSuggestionCache:
+    """Keep suggestion results keyed by entity id and content hash."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        # Suggestion results can be large; serialize them in the executor.
+        self._store = Store(
+            hass,
+            SUGGESTIONS_STORAGE_VERSION,
+            SUGGESTIONS_STORAGE_KEY,
+            serialize_in_event_loop=False,
+        )
+        self._entities: dict[str, dict[str, Any]] | None = None
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._job: asyncio.Task | None = None
+        self._progress: dict[str, Any] = {
+            "running": False,
+            "done": 0,
+            "failed": 0,
+            "total": 0,
+            "error": None,
+        }
+
+    async def async_load(self) -> dict[str, dict[str, Any]]:
+        if self._entities is None:
+            data = await self._store.async_load() or {}
+            self._entities = data.get("entities", {})
+        return self._entities
+
+    def _track(self, section: str) -> AbstractContextManager[None]:
+        monitor = self._hass.data.get(DOMAIN, {}).get("loop_monitor")
+        if monitor is None:
+            return nullcontext()
+        return monitor.track(section)
+
+    @property
+    def progress(self) -> dict[str, Any]:
+        return dict(self._progress)
+
+    @property
+    def running(self) -> bool:
+        return self._job is not None and not self._job.done()
+
+    async def async_partition(
+        self, entities: list[Entity], *, prune: bool = False
+    ) -> tuple[list[dict[str, Any]], list[Entity]]:
+        """Split entities into cached suggestions and entities needing a refresh.
+
+        With ``prune`` the list is taken to be the whole registry and cached
+        results for entities no longer present are dropped.
+        """
+        cached_entities = await self.async_load()
+        cached: list[dict[str, Any]] = []
+        stale: list[Entity] = []
+        # Hashing every entity is the expensive part on large registries, so
+        # yield to the loop between chunks.
+        for start in range(0, len(entities), PARTITION_CHUNK):
+            if start:
+                await asyncio.sleep(0)
+            with self._track("suggestion_partition"):
+                for entity in entities[start : start + PARTITION_CHUNK]:
+                    record = cached_entities.get(entity.get("entity_id"))
+                    if record and record.get("hash") == entity_hash(entity):
+                        if record.get("suggestion") is not None:
+                            cached.append(record["suggestion"])
+                    else:
+                        stale.append(entity)
+        stats = cache_stats(self._hass, "suggestions")
+        stats.record(True, len(entities) - len(stale))
+        stats.record(False, len(stale))
+        if prune:
+            current = {entity.get("entity_id") for entity in entities}
+            removed = [key for key in cached_entities if key not in current]
+            for key in removed:
+                del cached_entities[key]
+            if removed:
+                self._async_schedule_save()
+        return cached, stale
+
+    async def async_cached(self) -> list[dict[str, Any]]:
+        cached_entities = await self.async_load()
+        return [
+            record["suggestion"]
+            for record in cached_entities.values()
+            if record.get("suggestion") is not None
+        ]
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[dict[str, Any]], None]
+    ) -> Callable[[], None]:
+        self._listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove
+
+    @callback
+    def _async_notify(self, event: dict[str, Any]) -> None:
+        for listener in list(self._listeners):
+            listener(event)
+
+    @callback
+    def async_start_refresh(
+        self,
+        client: HAAgentApi,
+        entities: list[Entity],
+        **suggest_kwargs: Any,
+    ) -> bool:
+        """Re-suggest ``entities`` in the background; False if a job is running."""
+        if self.running or not entities:
+            return False
+        self._progress = {
+            "running": True,
+            "done": 0,
+            "failed": 0,
+            "total": len(entities),
+            "error": None,
+        }
+        self._job = self._hass.async_create_background_task(
+            self._async_refresh(client, entities, suggest_kwargs),
+            "home_assistant_agent suggestion refresh",
+        )
+        return True
+
+    async def _async_refresh(
+        self,
+        client: HAAgentApi,
+        entities: list[Entity],
+        suggest_kwargs: dict[str, Any],
+    ) -> None:
+        """Suggest shards concurrently, storing and streaming each as it lands.
+
+        A shard that keeps failing is left out of the cache, so the next
+        refresh resubmits only its entities.
+        """
+        cached_entities = await self.async_load()
+        semaphore = asyncio.Semaphore(SUGGEST_CONCURRENCY)
+
+        async def _async_suggest_shard(shard: list[Entity]) -> None:
+            result: Any = None
+            error: Exception | None = None
+            for attempt in range(SUGGEST_SHARD_RETRIES + 1):
+                if attempt:
+                    await asyncio.sleep(SUGGEST_RETRY_DELAY * 2 ** (attempt - 1))
+                try:
+                    async with semaphore:
+                        result = await client.async_entity_suggest(
+                            entities=[entity_dict(entity) for entity in shard],
+                            **suggest_kwargs,
+                        )
+                    error = None
+                    break
+                except HomeAssistantError as exc:
+                    _LOGGER.debug(
+                        "Suggestion shard of %s entities failed (attempt %s): %s",
+                        len(shard),
+                        attempt + 1,
+                        exc,
+                    )
+                    error = exc
+                    if (
+                        isinstance(exc, HAAgentResponseError)
+                        and exc.status < 500
+                        and exc.status not in RETRYABLE_CLIENT_STATUSES
+                    ):
+                        break
+            if error is not None:
+                self._progress["failed"] += len(shard)
+                self._progress["error"] = str(error)
+                self._async_notify({"type": "progress", **self.progress})
+                return
+            by_entity = _split_suggestions(result)
+            # Entities the core had nothing to say about are cached as None
+            # so they are not resubmitted until they change.
+            for entity in shard:
+                entity_id = entity.get("entity_id")
+                cached_entities[entity_id] = {
+                    "hash": entity_hash(entity),
+                    "suggestion": by_entity.get(entity_id),
+                }
+            self._async_schedule_save()
+            self._progress["done"] += len(shard)
+            self._async_notify(
+                {
+                    "type": "progress",
+                    **self.progress,
+                    "suggestions": list(by_entity.values()),
+                }
+            )
+
+        try:
+            results = await asyncio.gather(
+                *(_async_suggest_shard(shard) for shard in shard_entities(entities)),
+                return_exceptions=True,
+            )
+            for exc in results:
+                if isinstance(exc, Exception):
+                    _LOGGER.warning("Suggestion refresh failed: %s", exc)
+                    self._progress["error"] = str(exc)
+        finally:
+            self._progress["running"] = False
+            if self._progress["failed"]:
+                _LOGGER.warning(
+                    "Suggestion refresh left %s entities unsuggested: %s",
+                    self._progress["failed"],
+                    self._progress["error"],
+                )
+            self._async_notify({"type": "complete", **self.progress})
+
+    @callback
+    def async_cancel(self) -> None:
+        if self.running:
+            self._job.cancel()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._store.async_delay_save(
+            lambda: {"entities": self._entities or {}}, SAVE_DELAY
+        )
@@ -0,0 +1,127 @@
+"""Text-to-speech platform backed by ha_agent_core."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, AsyncIterable
+import re
+from typing import Any
+
+from homeassistant.components.tts import (
+    TextToSpeechEntity,
+    TtsAudioType,
+    TTSAudioRequest,
+    TTSAudioResponse,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .api import HAAgentApi
+from .const import (
+    DEFAULT_SPEECH_LANGUAGE,
+    DOMAIN,
+    SPEECH_LANGUAGES,
+    TTS_AUDIO_FORMAT,
+)
+
+ATTR_VOICE = "voice"
+# Long run-on text is flushed even without a sentence boundary so the first
+# audio chunk is never held back for more than this many characters.
+MAX_SENTENCE_CHARS = 300
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+")
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    async_add_entities([HAAgentTTSEntity(hass, entry)])
+
+
+async def _sentences(message_gen: AsyncIterable[str]) -> AsyncGenerator[str, None]:
+    """Regroup streamed text into sentences as soon as each one is complete."""
+    buffer = ""
+    async for part in message_gen:
+        buffer += part
+        pieces = _SENTENCE_END.split(buffer)
+        buffer = pieces.pop()
+        for sentence in pieces:
+            if sentence.strip():
+                yield sentence.strip()
+        if len(buffer) > MAX_SENTENCE_CHARS:
+            yield buffer.strip()
+            buffer = ""
+    if buffer.strip():
+        yield buffer.strip()
+
+
+class HAAgentTTSEntity(TextToSpeechEntity):
+    """Synthesize speech through ha_agent_core, streaming audio as it arrives."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Text-to-speech"
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self.hass = hass
+        self._entry_id = entry.entry_id
+        self._attr_unique_id = f"{entry.entry_id}_tts"
+
+    @property
+    def supported_languages(self) -> list[str]:
+        return SPEECH_LANGUAGES
+
+    @property
+    def default_language(self) -> str:
+        return DEFAULT_SPEECH_LANGUAGE
+
+    @property
+    def supported_options(self) -> list[str]:
+        return [ATTR_VOICE]
+
+    def _client(self) -> HAAgentApi:
+        entry_data = (
+            self.hass.data.get(DOMAIN, {}).get("entries", {}).get(self._entry_id, {})
+        )
+        client = entry_data.get("client")
+        if not client:
+            raise HomeAssistantError("Home Assistant Agent is not set up")
+        return client
+
+    async def async_get_tts_audio(
+        self, message: str, language: str, options: dict[str, Any]
+    ) -> TtsAudioType:
+        chunks = [
+            chunk
+            async for chunk in self._client().async_tts_stream(
+                message,
+                language=language,
+                voice=options.get(ATTR_VOICE),
+                audio_format=TTS_AUDIO_FORMAT,
+            )
+        ]
+        return TTS_AUDIO_FORMAT, b"".join(chunks)
+
+    async def async_stream_tts_audio(
+        self, request: TTSAudioRequest
+    ) -> TTSAudioResponse:
+        """Synthesize sentence by sentence so playback starts on the first chunk.
+
+        MP3 frames concatenate cleanly, so the per-sentence streams can be
+        joined into one response.
+        """
+        client = self._client()
+        voice = request.options.get(ATTR_VOICE)
+
+        async def _audio() -> AsyncGenerator[bytes, None]:
+            async for sentence in _sentences(request.message_gen):
+                async for chunk in client.async_tts_stream(
+                    sentence,
+                    language=request.language,
+                    voice=voice,
+                    audio_format=TTS_AUDIO_FORMAT,
+                ):
+                    yield chunk
+
+        return TTSAudioResponse(extension=TTS_AUDIO_FORMAT, data_gen=_audio())
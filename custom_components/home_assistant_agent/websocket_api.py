@@ -0,0 +1,152 @@
+"""Websocket commands for Home Assistant Agent."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .api import HAAgentApi
+from .const import DOMAIN, SIGNAL_ADDON_CONFIG_UPDATED
+from .journal_index import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from .suggestions import HAAgentSuggestionCache
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_subscribe_suggestions)
+    websocket_api.async_register_command(hass, ws_subscribe_journals)
+    websocket_api.async_register_command(hass, ws_search_journals)
+    websocket_api.async_register_command(hass, ws_subscribe_config)
+
+
+def _entry_client(hass: HomeAssistant, entry_id: str | None) -> HAAgentApi | None:
+    entries = hass.data.get(DOMAIN, {}).get("entries", {})
+    if entry_id:
+        entry_data = entries.get(entry_id)
+    else:
+        entry_data = next(iter(entries.values()), None)
+    return entry_data.get("client") if entry_data else None
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "home_assistant_agent/suggest/subscribe"}
+)
+@callback
+def ws_subscribe_suggestions(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Push suggestion refresh progress as batches complete."""
+    cache: HAAgentSuggestionCache = hass.data[DOMAIN]["suggestions"]
+
+    @callback
+    def _forward(event: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], event))
+
+    connection.subscriptions[msg["id"]] = cache.async_add_listener(_forward)
+    connection.send_result(msg["id"], cache.progress)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "home_assistant_agent/journals/subscribe",
+        vol.Required("names"): [str],
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def ws_subscribe_journals(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream the requested journals one event at a time as they arrive."""
+    client = _entry_client(hass, msg.get("entry_id"))
+    if client is None:
+        connection.send_error(msg["id"], "not_found", "No config entry found")
+        return
+
+    async def _stream() -> None:
+        async for name, journal in client.async_iter_journals(msg["names"]):
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"], {"type": "journal", "name": name, "journal": journal}
+                )
+            )
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"type": "complete"})
+        )
+
+    task = hass.async_create_task(_stream())
+    connection.subscriptions[msg["id"]] = task.cancel
+    connection.send_result(msg["id"])
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "home_assistant_agent/journals/search",
+        vol.Required("query"): str,
+        vol.Optional("journal"): str,
+        vol.Optional("limit", default=DEFAULT_SEARCH_LIMIT): vol.All(
+            int, vol.Range(min=1, max=MAX_SEARCH_LIMIT)
+        ),
+    }
+)
+@websocket_api.async_response
+async def ws_search_journals(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Search the local journal mirror."""
+    index = hass.data.get(DOMAIN, {}).get("journal_index")
+    if index is None:
+        connection.send_error(
+            msg["id"], "not_enabled", "The journal mirror is not enabled"
+        )
+        return
+    results = await index.async_search(
+        msg["query"], journal=msg.get("journal"), limit=msg["limit"]
+    )
+    connection.send_result(msg["id"], {"results": results})
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): "home_assistant_agent/config/subscribe"}
+)
+@callback
+def ws_subscribe_config(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Tell panels the add-on config version whenever the cached copy changes.
+
+    ``origin`` is the id a panel sent with the save that caused the change,
+    if any, so that panel can skip reloading its own write.
+    """
+
+    @callback
+    def _forward(entry_id: str, version: str | None, origin: str | None) -> None:
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "type": "config",
+                    "entry_id": entry_id,
+                    "version": version,
+                    "origin": origin,
+                },
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_ADDON_CONFIG_UPDATED, _forward
+    )
+    connection.send_result(msg["id"])
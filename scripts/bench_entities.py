@@ -0,0 +1,166 @@
+"""Measure memory per entity and encode time of the entity payload.
+
+    python scripts/bench_entities.py --entities 50000
+
+Builds a synthetic registry-shaped payload twice, as plain dicts (the old
+representation) and as EntityRecord objects, and reports the traced bytes
+per entity for each. With orjson installed it also times encoding the whole
+payload through entity_dict, as the entities view does, and measures the event
+loop lag that encoding causes in one go versus in slices that yield between
+them, using the integration's LoopLagMonitor. entities.py and loop_monitor.py
+are loaded on their own, so this runs without Home Assistant installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import importlib.util
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = ROOT / "custom_components" / "home_assistant_agent"
+# Sample often enough that one encode spans several lag windows.
+LAG_SAMPLE_INTERVAL = 0.005
+# Entities per encoded slice; ENTITY_PAYLOAD_CHUNK in the integration.
+ENCODE_CHUNK = 500
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _load_module(name: str):
+    spec = importlib.util.spec_from_file_location(
+        f"ha_agent_{name}", PACKAGE / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    # dataclass() resolves the module through sys.modules.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _fresh(text: str) -> str:
+    # Build a new string object each time, as values read from state
+    # attributes and registry entries are.
+    return "".join(list(text))
+
+
+def _rows(count: int) -> list[tuple[Any, ...]]:
+    classes = ["temperature", "humidity", "motion", "door", None]
+    units = ["°C", "%", None, None, None]
+    return [
+        (
+            f"sensor.room_{i // 20}_{i}",
+            f"Room {i // 20} sensor {i}",
+            classes[i % len(classes)],
+            units[i % len(units)],
+            f"Area {i // 20}",
+            f"Device {i // 3}",
+        )
+        for i in range(count)
+    ]
+
+
+def _measure(build: Callable[[], list[Any]]) -> tuple[list[Any], int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    payload = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return payload, after - before
+
+
+def _encode(module, entities: list[Any]) -> bytes:
+    # The view encodes records through entity_dict; dicts pass through.
+    return orjson.dumps([module.entity_dict(entity) for entity in entities])
+
+
+def _encode_ms(module, payload: list[Any]) -> float | None:
+    if orjson is None:
+        return None
+    start = time.perf_counter()
+    _encode(module, payload)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _loop_lag_ms(
+    module, monitor_module, payload: list[Any], sliced: bool
+) -> float:
+    """Return the worst loop lag seen while encoding ``payload``."""
+    loop = asyncio.get_running_loop()
+    monitor = monitor_module.LoopLagMonitor(loop, interval=LAG_SAMPLE_INTERVAL)
+    monitor.start()
+    # Let a few windows pass so the first sample is not the encode itself.
+    await asyncio.sleep(LAG_SAMPLE_INTERVAL * 4)
+    if sliced:
+        parts = []
+        for start in range(0, len(payload), ENCODE_CHUNK):
+            await asyncio.sleep(0)
+            with monitor.track("encode"):
+                parts.append(_encode(module, payload[start : start + ENCODE_CHUNK]))
+    else:
+        with monitor.track("encode"):
+            _encode(module, payload)
+    await asyncio.sleep(LAG_SAMPLE_INTERVAL * 4)
+    monitor.stop()
+    return monitor.snapshot()["loop_lag"]["max_ms"] or 0.0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--entities", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    module = _load_module("entities")
+    monitor_module = _load_module("loop_monitor")
+    rows = _rows(args.entities)
+    fields = module.ENTITY_FIELDS
+
+    def _dicts() -> list[dict[str, Any]]:
+        return [
+            dict(zip(fields, (_fresh(v) if isinstance(v, str) else v for v in row)))
+            for row in rows
+        ]
+
+    def _records() -> list[Any]:
+        return [
+            module.EntityRecord.create(
+                *(_fresh(v) if isinstance(v, str) else v for v in row)
+            )
+            for row in rows
+        ]
+
+    results = {}
+    lag: dict[str, float] = {}
+    for label, build in (("dict", _dicts), ("EntityRecord", _records)):
+        payload, size = _measure(build)
+        results[label] = (size / args.entities, _encode_ms(module, payload))
+        if orjson is not None and label == "EntityRecord":
+            for mode, sliced in (("in one go", False), ("in slices", True)):
+                lag[mode] = asyncio.run(
+                    _loop_lag_ms(module, monitor_module, payload, sliced)
+                )
+        del payload
+
+    print(f"{args.entities} entities")
+    for label, (per_entity, encode_ms) in results.items():
+        encode = f", encode {encode_ms:.1f} ms" if encode_ms is not None else ""
+        print(f"  {label:>12}: {per_entity:7.1f} bytes/entity{encode}")
+    base = results["dict"][0]
+    print(f"  saving: {(1 - results['EntityRecord'][0] / base):.0%}")
+    for mode, max_ms in lag.items():
+        print(f"  max loop lag encoding {mode}: {max_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Check the memory mirror against a scripted ha_agent_core.
+
+Run from the repository root in an environment with homeassistant and numpy
+installed:
+
+    python scripts/check_memory_index.py
+
+Records and queries are embedded with ``hashed_embedding``, so every run
+indexes the same vectors and ranks results the same way. The scripted core
+pages ``/memory/records`` with or without ``since_id`` support and with or
+without deleted ids; each variant must give the same top scores as a
+brute-force ranking, drop deleted and edited records, and never report a kind
+as fresh after a sync that stopped early. Exits with status 1 on a failure.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sys
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from custom_components.home_assistant_agent.memory_index import (  # noqa: E402
+    SYNC_PAGE_SIZE,
+    MemoryIndex,
+    hashed_embedding,
+)
+
+KIND = "fact"
+RECORDS = SYNC_PAGE_SIZE * 2 + 37
+TOPICS = ["kitchen lights", "garage door", "spare key", "heating schedule"]
+
+
+def _content(number: int) -> str:
+    return f"note {number} about the {TOPICS[number % len(TOPICS)]}"
+
+
+class ScriptedCore:
+    """Serve ``/memory/records`` from a dict, optionally ignoring paging."""
+
+    def __init__(
+        self, *, since_id: bool, tombstones: bool, offset: bool = True
+    ) -> None:
+        self.records = {
+            str(number): {"id": str(number), "content": _content(number)}
+            for number in range(RECORDS)
+        }
+        self.since_id = since_id
+        self.tombstones = tombstones
+        self.offset = offset
+        self.deleted: list[str] = []
+        self.embedded = 0
+
+    async def async_memory_records(
+        self,
+        kind: str,
+        *,
+        since_id: str | None = None,
+        offset: int | None = None,
+        limit: int | None = None,
+        embeddings: bool = False,
+    ) -> dict[str, Any]:
+        ids = sorted(self.records, key=int)
+        if since_id is not None and self.since_id:
+            ids = [record_id for record_id in ids if int(record_id) > int(since_id)]
+        elif offset is not None and self.offset:
+            ids = ids[offset:]
+        page = []
+        for record_id in ids[:limit]:
+            record = dict(self.records[record_id])
+            if embeddings:
+                record["embedding"] = hashed_embedding(record["content"]).tolist()
+                self.embedded += 1
+            page.append(record)
+        data: dict[str, Any] = {"records": page}
+        if self.tombstones:
+            data["deleted"] = list(self.deleted)
+        return data
+
+
+def _expected(core: ScriptedCore, text: str, limit: int) -> list[float]:
+    query = hashed_embedding(text)
+    scores = sorted(
+        (
+            float(hashed_embedding(record["content"]) @ query)
+            for record in core.records.values()
+        ),
+        reverse=True,
+    )
+    return [round(score, 4) for score in scores[:limit]]
+
+
+def _local_scores(index: MemoryIndex, text: str, limit: int) -> list[float] | None:
+    answer = index.query(KIND, text, limit=limit)
+    if answer is None:
+        return None
+    return [record["score"] for record in answer["results"]]
+
+
+async def _check_variant(name: str, core: ScriptedCore) -> list[str]:
+    failures: list[str] = []
+
+    def check(condition: bool, message: str) -> None:
+        if not condition:
+            failures.append(f"{name}: {message}")
+
+    index = MemoryIndex(embed=hashed_embedding)
+    index.track(KIND)
+    index.learn("seed", {"status": "success", "results": [{"id": "x", "score": 1}]})
+    await index.async_sync(core)
+    check(index.stats()["kinds"][KIND]["records"] == RECORDS, "full sync incomplete")
+    text = "where is the spare key"
+    check(
+        _local_scores(index, text, 5) == _expected(core, text, 5),
+        "local scores differ from brute force",
+    )
+    check(
+        np.array_equal(hashed_embedding(text), hashed_embedding(text)),
+        "hashed_embedding is not deterministic",
+    )
+
+    del core.records["2"]
+    core.deleted.append("2")
+    core.records["5"]["content"] = "note 5 about the garden hose"
+    core.records[str(RECORDS)] = {"id": str(RECORDS), "content": _content(RECORDS)}
+    embedded = core.embedded
+    await index.async_sync(core)
+    ids = set(index._kinds[KIND].ids)
+    check("2" not in ids, "deleted record still indexed")
+    check(str(RECORDS) in ids, "new record not indexed")
+    if not core.tombstones:
+        # One new record, plus at most a few around the offset fallback.
+        check(
+            core.embedded - embedded < 10,
+            "incremental sync re-downloaded the embeddings",
+        )
+        check(not index.fresh(KIND), "edited record left the kind fresh")
+        await index.async_sync(core)
+    records = {record["id"]: record for record in index._kinds[KIND].records}
+    if not core.tombstones:
+        check(
+            records.get("5", {}).get("content") == core.records["5"]["content"],
+            "edited record not reloaded",
+        )
+    check(index.fresh(KIND), "kind not fresh after a complete sync")
+    return failures
+
+
+async def _check_stalled() -> list[str]:
+    core = ScriptedCore(since_id=False, tombstones=False, offset=False)
+    index = MemoryIndex(embed=hashed_embedding)
+    index.track(KIND)
+    await index.async_sync(core)
+    if index.fresh(KIND):
+        return ["stalled paging: partial index reported as fresh"]
+    return []
+
+
+async def _main() -> int:
+    failures: list[str] = []
+    for name, core in (
+        ("since_id", ScriptedCore(since_id=True, tombstones=False)),
+        ("since_id+deleted", ScriptedCore(since_id=True, tombstones=True)),
+        ("offset fallback", ScriptedCore(since_id=False, tombstones=False)),
+    ):
+        failures += await _check_variant(name, core)
+    failures += await _check_stalled()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print("ok" if not failures else f"{len(failures)} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main()))
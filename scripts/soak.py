@@ -0,0 +1,804 @@
+"""Soak test Home Assistant Agent against a local stub ha_agent_core.
+
+Run from the repository root in an environment with homeassistant installed:
+
+    python scripts/soak.py --conversations 300 --duration 120
+    python scripts/soak.py --write-baseline
+
+``soak_baseline.json`` next to this script holds the committed baseline for
+the default settings.
+
+Many simultaneous conversations go through
+``HAAgentConversationAgent.async_process``, mixed with streaming STT/TTS
+traffic and with settings and entity suggest requests sent to the
+integration's own HTTP views, as the panel sends them. Suggest requests go
+through the suggestion cache, so its sharded refresh runs under load
+(``suggest_refresh`` is the time until a refresh it started finished). The
+integration shares Home Assistant's client session as it does in production.
+The run reports latency distributions (including TTS time to first audio as
+``tts_first_audio`` and the STT delay between the last audio chunk and the
+transcript as ``stt_final``), error rates, connection pool saturation, event
+loop lag and memory growth, and exits with status 1 when a metric regresses
+past the stored baseline. The stub and the views share the event loop with
+the integration, so loop lag includes their (small) request handling.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import fields
+import inspect
+import json
+import math
+from pathlib import Path
+import random
+import socket
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+from typing import Any, AsyncIterator
+import uuid
+import warnings
+
+import aiohttp
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.components.conversation import ConversationInput  # noqa: E402
+from homeassistant.components.network import async_get_network  # noqa: E402
+from homeassistant.config_entries import ConfigEntries, ConfigEntry  # noqa: E402
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import Context, HomeAssistant  # noqa: E402
+from homeassistant.helpers import aiohttp_client  # noqa: E402
+from homeassistant.helpers.http import KEY_AUTHENTICATED, KEY_HASS  # noqa: E402
+
+from custom_components.home_assistant_agent import (  # noqa: E402
+    HAAgentSettingsView,
+    HAAgentSuggestView,
+    _default_domain_data,
+)
+from custom_components.home_assistant_agent.api import HAAgentApi  # noqa: E402
+from custom_components.home_assistant_agent.const import (  # noqa: E402
+    DEFAULT_ERROR_REPLY,
+    DEFAULT_TIMEOUT_REPLY,
+    DOMAIN,
+)
+from custom_components.home_assistant_agent.conversation import (  # noqa: E402
+    HAAgentConversationAgent,
+)
+
+ENTRY_ID = "soak"
+DEFAULT_BASELINE = Path(__file__).with_name("soak_baseline.json")
+SUGGEST_BATCH = 50
+# Entities the panel suggests for, spread over areas, and how many of them
+# each suggest request renames so the cache has stale entities to refresh.
+SUGGEST_POOL = 200
+SUGGEST_AREAS = 20
+SUGGEST_RENAMES = 10
+SUGGEST_POLL_INTERVAL = 0.2
+# Streamed audio: chunks per TTS reply and per STT utterance, and the pause
+# between STT chunks (4 KiB of 16 kHz 16-bit mono is about 128 ms).
+TTS_CHUNKS = 12
+STT_CHUNKS = 10
+AUDIO_CHUNK = b"\0" * 4096
+STT_CHUNK_INTERVAL = 0.128
+
+# Allowed regression against the baseline: relative, plus an absolute slack
+# so near-zero baselines do not fail on noise.
+LATENCY_TOLERANCE = 0.25
+LATENCY_SLACK_MS = 5.0
+ERROR_RATE_SLACK = 0.01
+SATURATION_SLACK = 0.05
+MEMORY_TOLERANCE = 0.5
+MEMORY_SLACK_KIB_PER_MIN = 256.0
+LOOP_LAG_TOLERANCE = 0.5
+LOOP_LAG_SLACK_MS = 10.0
+
+
+class StubCore:
+    """In-process ha_agent_core with configurable latency and error rate."""
+
+    def __init__(self, latency_ms: float, error_rate: float, rng: random.Random) -> None:
+        self._latency = latency_ms / 1000
+        self._error_rate = error_rate
+        self._rng = rng
+        self._history: dict[str, int] = {}
+        self._config: dict[str, Any] = {
+            "model_reasoning": "stub-reasoning",
+            "model_fast": "stub-fast",
+            "instruction": "",
+            "api_keys": {},
+        }
+        self._version = 1
+        self.app = web.Application()
+        self.app.add_routes(
+            [
+                web.post("/chat", self._chat),
+                web.get("/config", self._get_config),
+                web.put("/config", self._put_config),
+                web.post("/entity/suggest", self._suggest),
+                web.post("/stt/stream", self._stt_stream),
+                web.post("/tts/stream", self._tts_stream),
+                web.get("/health", self._health),
+            ]
+        )
+
+    async def _delay(self, scale: float = 1.0) -> None:
+        await asyncio.sleep(self._rng.lognormvariate(0, 0.5) * self._latency * scale)
+
+    def _failed(self) -> bool:
+        return self._rng.random() < self._error_rate
+
+    async def _chat(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        await self._delay()
+        if self._failed():
+            return web.json_response({"error": "stub failure"}, status=500)
+        conversation_id = payload.get("conversation_id") or uuid.uuid4().hex
+        version = self._history.get(conversation_id)
+        sent = payload.get("history_version")
+        if sent is not None and sent != version:
+            return web.json_response({"error": "history_version mismatch"}, status=409)
+        version = (version or 0) + 1
+        self._history[conversation_id] = version
+        return web.json_response(
+            {
+                "response": f"ok: {payload.get('text', '')[:32]}",
+                "conversation_id": conversation_id,
+                "history_version": version,
+            }
+        )
+
+    def _document(self) -> dict[str, Any]:
+        return {"status": "success", "config": self._config, "version": self._version}
+
+    async def _get_config(self, request: web.Request) -> web.Response:
+        await self._delay(0.2)
+        if request.headers.get("If-None-Match") == f'"{self._version}"':
+            return web.Response(status=304)
+        return web.json_response(self._document())
+
+    async def _put_config(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        await self._delay(0.5)
+        expected = request.headers.get("If-Match")
+        if expected is not None and expected != f'"{self._version}"':
+            return web.json_response(self._document(), status=412)
+        self._config.update(payload)
+        self._version += 1
+        return web.json_response(self._document())
+
+    async def _suggest(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        entities = payload.get("entities") or []
+        await self._delay(1 + len(entities) / SUGGEST_BATCH)
+        if self._failed():
+            return web.json_response({"error": "stub failure"}, status=500)
+        return web.json_response(
+            {
+                "suggestions": [
+                    {"entity_id": entity["entity_id"], "aliases": [entity["name"]]}
+                    for entity in entities
+                ]
+            }
+        )
+
+    async def _stt_stream(self, request: web.Request) -> web.Response:
+        # Consume the upload as it arrives, like a streaming recognizer.
+        received = 0
+        async for chunk in request.content.iter_any():
+            received += len(chunk)
+        await self._delay(0.5)
+        if self._failed():
+            return web.json_response({"error": "stub failure"}, status=500)
+        return web.json_response({"text": f"heard {received} bytes"})
+
+    async def _tts_stream(self, request: web.Request) -> web.StreamResponse:
+        await request.json()
+        # The first chunk costs a full model step, later ones a fraction.
+        await self._delay()
+        if self._failed():
+            return web.json_response({"error": "stub failure"}, status=500)
+        response = web.StreamResponse(headers={"Content-Type": "audio/mpeg"})
+        await response.prepare(request)
+        for index in range(TTS_CHUNKS):
+            if index:
+                await self._delay(0.1)
+            await response.write(AUDIO_CHUNK)
+        await response.write_eof()
+        return response
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+
+class Recorder:
+    """Latency samples and error counts per operation."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.conflicts = 0
+
+    def record(self, op: str, started: float, ok: bool) -> None:
+        """Record the time since ``started`` (a ``perf_counter`` value)."""
+        self.latencies.setdefault(op, []).append(time.perf_counter() - started)
+        if not ok:
+            self.errors[op] = self.errors.get(op, 0) + 1
+
+    def summary(self) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        for op, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            result[op] = {
+                "count": len(ordered),
+                "error_rate": round(self.errors.get(op, 0) / len(ordered), 4),
+                **{
+                    f"p{pct}_ms": round(_percentile(ordered, pct) * 1000, 2)
+                    for pct in (50, 90, 95, 99)
+                },
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+        return result
+
+
+class PoolTracer:
+    """Track requests in flight and waiting for a pooled connection.
+
+    Uses aiohttp's public tracing hooks. A request is queued when the
+    connector has no free connection, so the share of samples with a queue
+    is the pool saturation.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.queued = 0
+        self.queue_waits: list[float] = []
+        self.config = aiohttp.TraceConfig()
+        self.config.on_request_start.append(self._request_start)
+        self.config.on_request_end.append(self._request_done)
+        self.config.on_request_exception.append(self._request_done)
+        self.config.on_connection_queued_start.append(self._queued_start)
+        self.config.on_connection_queued_end.append(self._queued_end)
+
+    async def _request_start(self, _session, context, _params) -> None:
+        self.in_flight += 1
+
+    async def _request_done(self, _session, context, _params) -> None:
+        self.in_flight -= 1
+
+    async def _queued_start(self, _session, context, _params) -> None:
+        self.queued += 1
+        context.queued_at = time.perf_counter()
+
+    async def _queued_end(self, _session, context, _params) -> None:
+        self.queued -= 1
+        self.queue_waits.append(time.perf_counter() - context.queued_at)
+
+    def sample(self) -> dict[str, int]:
+        return {"in_use": self.in_flight, "queued": self.queued}
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    rank = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def _slope_per_minute(points: list[tuple[float, float]]) -> float:
+    """Least-squares slope of (seconds, value) points, scaled to per minute."""
+    if len(points) < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_v = sum(v for _, v in points) / len(points)
+    denom = sum((t - mean_t) ** 2 for t, _ in points)
+    if not denom:
+        return 0.0
+    slope = sum((t - mean_t) * (v - mean_v) for t, v in points) / denom
+    return slope * 60
+
+
+def _conversation_input(text: str, conversation_id: str | None) -> ConversationInput:
+    # ConversationInput gains fields between Home Assistant releases; pass
+    # only the ones this version knows.
+    values = {
+        "text": text,
+        "context": Context(),
+        "conversation_id": conversation_id,
+        "device_id": None,
+        "satellite_id": None,
+        "language": "en",
+        "agent_id": ENTRY_ID,
+        "extra_system_prompt": None,
+    }
+    known = {field.name for field in fields(ConversationInput)}
+    return ConversationInput(**{key: value for key, value in values.items() if key in known})
+
+
+async def _conversation_worker(
+    agent: HAAgentConversationAgent,
+    recorder: Recorder,
+    stop: float,
+    think: float,
+    rng: random.Random,
+) -> None:
+    conversation_id: str | None = None
+    turn = 0
+    # Stagger the first turns so the run does not start with one burst.
+    await asyncio.sleep(rng.uniform(0, think))
+    while time.monotonic() < stop:
+        turn += 1
+        started = time.perf_counter()
+        try:
+            result = await agent.async_process(
+                _conversation_input(f"turn {turn}: turn on the lights", conversation_id)
+            )
+        except Exception:  # noqa: BLE001
+            recorder.record("conversation", started, False)
+        else:
+            speech = result.response.speech.get("plain", {}).get("speech")
+            ok = speech not in (DEFAULT_ERROR_REPLY, DEFAULT_TIMEOUT_REPLY)
+            recorder.record("conversation", started, ok)
+            conversation_id = result.conversation_id
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+
+async def _suggest_worker(
+    panel: aiohttp.ClientSession,
+    url: str,
+    entities: list[dict[str, Any]],
+    recorder: Recorder,
+    stop: float,
+    interval: float,
+    rng: random.Random,
+) -> None:
+    """Post panel entities to the suggest view and wait out started refreshes."""
+    while time.monotonic() < stop:
+        for entity in rng.sample(entities, SUGGEST_RENAMES):
+            entity["name"] = f"Soak light {rng.randrange(100000)}"
+        started = time.perf_counter()
+        try:
+            async with panel.post(
+                url,
+                json={"entry_id": ENTRY_ID, "entities": entities, "use_llm": True},
+            ) as resp:
+                data = await resp.json()
+                ok = resp.status == 200
+        except (aiohttp.ClientError, ValueError):
+            recorder.record("suggest", started, False)
+        else:
+            recorder.record("suggest", started, ok)
+            if ok and data.get("started"):
+                await _wait_for_refresh(panel, url, recorder, started)
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * interval)
+
+
+async def _wait_for_refresh(
+    panel: aiohttp.ClientSession, url: str, recorder: Recorder, started: float
+) -> None:
+    while True:
+        await asyncio.sleep(SUGGEST_POLL_INTERVAL)
+        try:
+            async with panel.get(url) as resp:
+                progress = (await resp.json())["progress"]
+        except (aiohttp.ClientError, ValueError, KeyError):
+            recorder.record("suggest_refresh", started, False)
+            return
+        if not progress["running"]:
+            recorder.record("suggest_refresh", started, not progress["failed"])
+            return
+
+
+async def _tts_worker(
+    client: HAAgentApi,
+    recorder: Recorder,
+    stop: float,
+    interval: float,
+    rng: random.Random,
+) -> None:
+    while time.monotonic() < stop:
+        started = time.perf_counter()
+        first = True
+        try:
+            async for _chunk in client.async_tts_stream(
+                f"reply {rng.randrange(1000)}", language="en"
+            ):
+                if first:
+                    recorder.record("tts_first_audio", started, True)
+                    first = False
+        except Exception:  # noqa: BLE001
+            if first:
+                recorder.record("tts_first_audio", started, False)
+            recorder.record("tts", started, False)
+        else:
+            recorder.record("tts", started, not first)
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * interval)
+
+
+async def _stt_worker(
+    client: HAAgentApi,
+    recorder: Recorder,
+    stop: float,
+    interval: float,
+    rng: random.Random,
+) -> None:
+    while time.monotonic() < stop:
+        finished: list[float] = []
+
+        async def _audio() -> AsyncIterator[bytes]:
+            for index in range(STT_CHUNKS):
+                if index:
+                    await asyncio.sleep(STT_CHUNK_INTERVAL)
+                yield AUDIO_CHUNK
+            finished.append(time.perf_counter())
+
+        started = time.perf_counter()
+        try:
+            result = await client.async_stt_stream(
+                _audio(),
+                language="en",
+                audio_format="wav",
+                codec="pcm",
+                sample_rate=16000,
+                bit_rate=16,
+                channels=1,
+            )
+        except Exception:  # noqa: BLE001
+            recorder.record("stt_final", finished[0] if finished else started, False)
+        else:
+            recorder.record(
+                "stt_final", finished[0] if finished else started, bool(result.get("text"))
+            )
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * interval)
+
+
+async def _settings_worker(
+    panel: aiohttp.ClientSession,
+    url: str,
+    recorder: Recorder,
+    stop: float,
+    interval: float,
+    write_ratio: float,
+    rng: random.Random,
+) -> None:
+    """Read and write settings through the settings view like the panel."""
+    origin = uuid.uuid4().hex
+    version: Any = None
+    while time.monotonic() < stop:
+        started = time.perf_counter()
+        # Writes carry the version of the last read, as the panel's do.
+        if version is not None and rng.random() < write_ratio:
+            op = "settings_write"
+            request = panel.post(
+                url,
+                json={
+                    "entry_id": ENTRY_ID,
+                    "instruction": f"soak {rng.random()}",
+                    "version": version,
+                    "origin": origin,
+                },
+            )
+        else:
+            op = "settings_read"
+            request = panel.get(url, params={"entry_id": ENTRY_ID})
+        try:
+            async with request as resp:
+                data = await resp.json()
+        except (aiohttp.ClientError, ValueError):
+            recorder.record(op, started, False)
+        else:
+            if resp.status == 409:
+                recorder.conflicts += 1
+            recorder.record(op, started, resp.status in (200, 409))
+            version = data.get("version", version)
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * interval)
+
+
+async def _sampler(
+    tracer: PoolTracer, stop: float, interval: float, samples: list[dict[str, Any]]
+) -> None:
+    start = time.monotonic()
+    while time.monotonic() < stop:
+        current, _peak = tracemalloc.get_traced_memory()
+        samples.append(
+            {
+                "t": time.monotonic() - start,
+                "memory_kib": current / 1024,
+                "pool": tracer.sample(),
+            }
+        )
+        await asyncio.sleep(interval)
+
+
+def _pool_summary(
+    samples: list[dict[str, Any]], tracer: PoolTracer, limit: int | None
+) -> dict[str, Any]:
+    in_use = [s["pool"]["in_use"] for s in samples]
+    saturated = sum(1 for s in samples if s["pool"]["queued"])
+    waits = sorted(tracer.queue_waits)
+    return {
+        "limit": limit,
+        "max_in_use": max(in_use, default=0),
+        "mean_in_use": round(sum(in_use) / len(in_use), 2) if in_use else 0,
+        "saturated_fraction": round(saturated / len(samples), 4) if samples else 0.0,
+        "queued_requests": len(waits),
+        "queue_wait_p95_ms": round(_percentile(waits, 95) * 1000, 2) if waits else 0.0,
+    }
+
+
+def _memory_summary(samples: list[dict[str, Any]], warmup: float) -> dict[str, Any]:
+    values = [s["memory_kib"] for s in samples]
+    steady = [(s["t"], s["memory_kib"]) for s in samples if s["t"] >= warmup]
+    return {
+        "start_kib": round(values[0], 1) if values else None,
+        "end_kib": round(values[-1], 1) if values else None,
+        "peak_kib": round(tracemalloc.get_traced_memory()[1] / 1024, 1),
+        "growth_kib_per_min": round(_slope_per_minute(steady), 1),
+    }
+
+
+async def _serve(app: web.Application) -> tuple[web.AppRunner, str]:
+    runner = web.AppRunner(app)
+    await runner.setup()
+    # Bind first so the ephemeral port is known without asking the server.
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    await web.SockSite(runner, sock).start()
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def _views_app(hass: HomeAssistant) -> web.Application:
+    """Serve the settings and suggest views as Home Assistant's http does."""
+
+    @web.middleware
+    async def _authenticated(request: web.Request, handler):
+        request[KEY_AUTHENTICATED] = True
+        return await handler(request)
+
+    app = web.Application(middlewares=[_authenticated])
+    app[KEY_HASS] = hass
+    with warnings.catch_warnings():
+        # The views read the string key, which Home Assistant also sets.
+        warnings.simplefilter("ignore")
+        app["hass"] = hass
+    for view in (HAAgentSettingsView(), HAAgentSuggestView()):
+        view.register(hass, app, app.router)
+    return app
+
+
+def _add_config_entry(hass: HomeAssistant) -> ConfigEntry:
+    # ConfigEntry gains arguments between Home Assistant releases; pass only
+    # the ones this version knows.
+    values = {
+        "data": {},
+        "discovery_keys": MappingProxyType({}),
+        "domain": DOMAIN,
+        "entry_id": ENTRY_ID,
+        "minor_version": 1,
+        "options": {},
+        "source": "user",
+        "subentries_data": None,
+        "title": "Soak",
+        "unique_id": None,
+        "version": 1,
+    }
+    known = inspect.signature(ConfigEntry).parameters
+    entry = ConfigEntry(**{key: value for key, value in values.items() if key in known})
+    hass.config_entries = ConfigEntries(hass, {})
+    # Registered without setting it up, as Home Assistant's MockConfigEntry
+    # does; the soak wires the entry's data itself.
+    hass.config_entries._entries[entry.entry_id] = entry
+    return entry
+
+
+def _panel_entities(rng: random.Random) -> list[dict[str, Any]]:
+    return [
+        {
+            "entity_id": f"light.soak_{index}",
+            "name": f"Soak light {index}",
+            "area": f"Area {rng.randrange(SUGGEST_AREAS)}",
+        }
+        for index in range(SUGGEST_POOL)
+    ]
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    stub = StubCore(args.core_latency_ms, args.core_error_rate, rng)
+    runner, core_url = await _serve(stub.app)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        # The shared client session resolves names through zeroconf, which
+        # needs the network adapters loaded.
+        await async_get_network(hass)
+        domain_data = hass.data[DOMAIN] = _default_domain_data(hass)
+        monitor = domain_data["loop_monitor"]
+        monitor.start()
+        # Same connector (and pool) as the shared session, plus tracing.
+        tracer = PoolTracer()
+        session = aiohttp_client.async_create_clientsession(
+            hass, trace_configs=[tracer.config]
+        )
+        client = HAAgentApi([core_url], session, loop_monitor=monitor)
+        domain_data["entries"][ENTRY_ID] = {
+            "client": client,
+            "entry": _add_config_entry(hass),
+            "settings": {},
+            "addon_config": None,
+            "addon_config_ts": 0.0,
+        }
+        agent = HAAgentConversationAgent(hass, ENTRY_ID)
+        views_runner, views_url = await _serve(_views_app(hass))
+        # The panel's requests come from the browser, not the shared session.
+        panel = aiohttp.ClientSession()
+        settings_url = f"{views_url}{HAAgentSettingsView.url}"
+        suggest_url = f"{views_url}{HAAgentSuggestView.url}"
+        panel_entities = _panel_entities(rng)
+
+        recorder = Recorder()
+        samples: list[dict[str, Any]] = []
+        tracemalloc.start()
+        stop = time.monotonic() + args.duration
+        workers = [
+            _conversation_worker(agent, recorder, stop, args.think, random.Random(rng.random()))
+            for _ in range(args.conversations)
+        ]
+        workers += [
+            _suggest_worker(
+                panel,
+                suggest_url,
+                panel_entities,
+                recorder,
+                stop,
+                args.suggest_interval,
+                random.Random(rng.random()),
+            )
+            for _ in range(args.suggest_workers)
+        ]
+        workers += [
+            _tts_worker(client, recorder, stop, args.audio_interval, random.Random(rng.random()))
+            for _ in range(args.tts_workers)
+        ]
+        workers += [
+            _stt_worker(client, recorder, stop, args.audio_interval, random.Random(rng.random()))
+            for _ in range(args.stt_workers)
+        ]
+        workers += [
+            _settings_worker(
+                panel,
+                settings_url,
+                recorder,
+                stop,
+                args.settings_interval,
+                args.write_ratio,
+                random.Random(rng.random()),
+            )
+            for _ in range(args.settings_workers)
+        ]
+        await asyncio.gather(_sampler(tracer, stop, args.sample_interval, samples), *workers)
+
+        report = {
+            "config": {
+                "conversations": args.conversations,
+                "tts_workers": args.tts_workers,
+                "stt_workers": args.stt_workers,
+                "duration_s": args.duration,
+                "core_latency_ms": args.core_latency_ms,
+                "core_error_rate": args.core_error_rate,
+            },
+            "homeassistant_version": HA_VERSION,
+            "operations": recorder.summary(),
+            "settings_conflicts": recorder.conflicts,
+            "connection_pool": _pool_summary(samples, tracer, session.connector.limit),
+            "memory": _memory_summary(samples, args.warmup),
+            "event_loop": monitor.snapshot(),
+        }
+        tracemalloc.stop()
+        monitor.stop()
+        domain_data["suggestions"].async_cancel()
+        await panel.close()
+        await views_runner.cleanup()
+        await hass.async_stop(force=True)
+    await runner.cleanup()
+    return report
+
+
+def _compare(report: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """Return one message per metric that regressed past its tolerance."""
+    regressions = []
+    for op, base in baseline.get("operations", {}).items():
+        current = report["operations"].get(op)
+        if current is None:
+            regressions.append(f"{op}: no samples (baseline had {base['count']})")
+            continue
+        limit = base["p95_ms"] * (1 + LATENCY_TOLERANCE) + LATENCY_SLACK_MS
+        if current["p95_ms"] > limit:
+            regressions.append(
+                f"{op}: p95 {current['p95_ms']} ms > {limit:.1f} ms (baseline {base['p95_ms']})"
+            )
+        limit = base["error_rate"] + ERROR_RATE_SLACK
+        if current["error_rate"] > limit:
+            regressions.append(
+                f"{op}: error rate {current['error_rate']} > {limit:.4f} (baseline {base['error_rate']})"
+            )
+    base_pool = baseline.get("connection_pool", {}).get("saturated_fraction", 0.0)
+    pool = report["connection_pool"]["saturated_fraction"]
+    if pool > base_pool + SATURATION_SLACK:
+        regressions.append(f"connection pool saturated {pool:.1%} of the time (baseline {base_pool:.1%})")
+    for key in ("loop_lag", "attributed_lag"):
+        base_lag = baseline.get("event_loop", {}).get(key, {}).get("p99_ms")
+        lag = report["event_loop"][key]["p99_ms"]
+        if base_lag is None or lag is None:
+            continue
+        limit = base_lag * (1 + LOOP_LAG_TOLERANCE) + LOOP_LAG_SLACK_MS
+        if lag > limit:
+            regressions.append(
+                f"event loop {key.replace('_', ' ')} p99 {lag} ms > {limit:.1f} ms "
+                f"(baseline {base_lag})"
+            )
+    base_growth = baseline.get("memory", {}).get("growth_kib_per_min")
+    if base_growth is not None:
+        growth = report["memory"]["growth_kib_per_min"]
+        limit = max(base_growth, 0) * (1 + MEMORY_TOLERANCE) + MEMORY_SLACK_KIB_PER_MIN
+        if growth > limit:
+            regressions.append(
+                f"memory growth {growth} KiB/min > {limit:.1f} KiB/min (baseline {base_growth})"
+            )
+    return regressions
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--suggest-workers", type=int, default=4)
+    parser.add_argument("--settings-workers", type=int, default=8)
+    parser.add_argument("--tts-workers", type=int, default=8)
+    parser.add_argument("--stt-workers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=10.0, help="seconds excluded from memory growth")
+    parser.add_argument("--think", type=float, default=1.0, help="mean pause between turns, seconds")
+    parser.add_argument("--suggest-interval", type=float, default=2.0)
+    parser.add_argument("--settings-interval", type=float, default=0.5)
+    parser.add_argument("--audio-interval", type=float, default=2.0, help="mean pause between STT/TTS requests")
+    parser.add_argument("--write-ratio", type=float, default=0.05, help="share of settings calls that write")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--core-latency-ms", type=float, default=150.0)
+    parser.add_argument("--core-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--write-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--report", type=Path, help="also write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    report = asyncio.run(_run(args))
+    text = json.dumps(report, indent=2, sort_keys=True)
+    print(text)
+    if args.report:
+        args.report.write_text(text + "\n")
+    if args.write_baseline:
+        args.baseline.write_text(text + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --write-baseline to create one.")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("config") != report["config"]:
+        print("Warning: baseline was recorded with different settings:", baseline.get("config"))
+    regressions = _compare(report, baseline)
+    for message in regressions:
+        print(f"REGRESSION: {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())